@@ -13,6 +13,13 @@ pub const LEN_SHEET_NAME_MAX: usize = 31;
 /// Characters not allowed in sheet names.
 pub const SHEET_NAME_ILLEGAL_CHRS: [&str; 7] = ["*", ":", "?", "/", "\\", "[", "]"];
 
+// Strategy/Preference/Adjustable Parameters for XLSX I/O operations.
+
+/// Minimum row chunk size when chunks are sized by estimated bytes.
+pub const NROWS_CHUNK_MIN: usize = 256;
+/// Estimated bytes per string cell when sizing row chunks from a schema.
+pub const NBYTES_STRING_CELL_ESTIMATED: usize = 32;
+
 /// Canonical format preset keys.
 #[derive(Debug, Clone, Copy, PartialEq, Eq)]
 pub enum FormatKey {
@@ -18,8 +18,12 @@ pub use spec::{
     XlsxValuePolicy, XlsxWriteOptions,
 };
 pub use util::{
-    apply_vertical_run_text_blankout, calculate_row_chunk_size, create_horizontal_merge_tracker,
-    derive_contiguous_ranges, plan_horizontal_merges, plan_sheet_slices,
+    HeaderMergePlan, apply_vertical_run_text_blankout, calculate_row_chunk_size,
+    calculate_row_chunk_size_with_row_bytes, create_horizontal_merge_tracker,
+    derive_contiguous_ranges, plan_header_merges, plan_horizontal_merges, plan_sheet_slices,
     plan_vertical_visual_merge_borders, sanitize_sheet_name,
 };
-pub use writer::{XlsxRecordBatch, XlsxRecordBatchResult, XlsxSheetWriteOptions, XlsxWriter};
+pub use writer::{
+    XlsxRecordBatch, XlsxRecordBatchResult, XlsxSheetWriteOptions, XlsxWriter,
+    estimate_arrow_row_bytes,
+};
@@ -71,6 +71,11 @@ impl CellFormatPatch {
         self.merge(&patch)
     }
 
+    /// Whether no property is set, making this patch a no-op under [`Self::merge`].
+    pub fn is_empty(&self) -> bool {
+        *self == CellFormatPatch::default()
+    }
+
     /// Merge two formats with right-side non-`None` overwrite semantics.
     pub fn merge(&self, other: &CellFormatPatch) -> CellFormatPatch {
         CellFormatPatch {
@@ -162,7 +167,7 @@ impl CellFormatPatch {
 }
 
 /// Border tuple for top/bottom/left/right.
-#[derive(Debug, Clone, PartialEq, Eq)]
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
 pub struct CellBorder {
     /// Top border style.
     pub top: i64,
@@ -243,6 +248,8 @@ pub struct XlsxRowChunkPolicy {
     pub size_default: usize,
     /// Force exact chunk size when set.
     pub fixed_size: Option<usize>,
+    /// Size chunks to this many estimated bytes when set, instead of by width.
+    pub target_bytes: Option<usize>,
 }
 
 impl Default for XlsxRowChunkPolicy {
@@ -254,6 +261,7 @@ impl Default for XlsxRowChunkPolicy {
             size_medium: 2_000,
             size_default: 10_000,
             fixed_size: None,
+            target_bytes: None,
         }
     }
 }
@@ -1,31 +1,31 @@
 //! Stateless helper utilities used by the XLSX writer kernel.
 
-use std::collections::{BTreeMap, BTreeSet};
+use std::collections::{BTreeMap, HashMap};
 
 use crate::constant::{
-    ColumnIdentifier, LEN_SHEET_NAME_MAX, NCOLS_SHEET_MAX, NROWS_SHEET_MAX, SHEET_NAME_ILLEGAL_CHRS,
+    ColumnIdentifier, LEN_SHEET_NAME_MAX, NCOLS_SHEET_MAX, NROWS_CHUNK_MIN, NROWS_SHEET_MAX,
+    SHEET_NAME_ILLEGAL_CHRS,
 };
 use crate::spec::{
-    CellBorder, CellValue, IntegerCoerceMode, SheetHorizontalMerge, SheetSlice, XlsxReport,
-    XlsxRowChunkPolicy, XlsxValuePolicy,
+    AutofitPolicy, CellBorder, CellValue, IntegerCoerceMode, SheetHorizontalMerge, SheetSlice,
+    XlsxReport, XlsxRowChunkPolicy, XlsxValuePolicy,
 };
 
 ////////////////////////////////////////////////////////////////////////////////
 // #region CellValueConversion
 
-/// Convert `NaN`/`Inf` to policy string; return error for finite values.
-fn convert_nan_inf_to_str(x: f64, value_policy: &XlsxValuePolicy) -> Result<String, String> {
+/// Map a non-finite value to its policy string: `NaN`, else `Inf` by sign.
+///
+/// Callers only pass non-finite values, so no finite check or error path is needed.
+fn convert_nan_inf_to_str(x: f64, value_policy: &XlsxValuePolicy) -> &str {
+    debug_assert!(!x.is_finite(), "Input must be NaN or Inf.");
     if x.is_nan() {
-        return Ok(value_policy.nan_str.clone());
-    }
-    if x.is_infinite() {
-        return Ok(if x.is_sign_positive() {
-            value_policy.posinf_str.clone()
-        } else {
-            value_policy.neginf_str.clone()
-        });
+        &value_policy.nan_str
+    } else if x.is_sign_positive() {
+        &value_policy.posinf_str
+    } else {
+        &value_policy.neginf_str
     }
-    Err("Input is neither NaN nor Inf.".to_string())
 }
 
 fn convert_infinite_number(
@@ -34,10 +34,7 @@ fn convert_infinite_number(
     value_policy: &XlsxValuePolicy,
 ) -> CellValue {
     if should_keep_missing_values {
-        CellValue::String(
-            convert_nan_inf_to_str(value, value_policy)
-                .unwrap_or_else(|_| value_policy.nan_str.clone()),
-        )
+        CellValue::String(convert_nan_inf_to_str(value, value_policy).to_owned())
     } else {
         CellValue::None
     }
@@ -64,7 +61,7 @@ fn convert_numeric_cell_to_integer(
 }
 
 fn convert_string_cell_to_integer(
-    value: &str,
+    value: String,
     should_keep_missing_values: bool,
     value_policy: &XlsxValuePolicy,
 ) -> CellValue {
@@ -73,7 +70,7 @@ fn convert_string_cell_to_integer(
     }
 
     if value_policy.integer_coerce == IntegerCoerceMode::Strict {
-        return CellValue::String(value.to_owned());
+        return CellValue::String(value);
     }
 
     if let Ok(_val) = value.parse::<f64>() {
@@ -83,94 +80,138 @@ fn convert_string_cell_to_integer(
         return CellValue::Number(_val as i64 as f64);
     }
 
-    CellValue::String(value.to_owned())
+    CellValue::String(value)
 }
 
-/// Normalize cell value according to numeric/integer flags and value policy.
-pub fn convert_cell_value(
-    value: &CellValue,
-    is_numeric_col: bool,
-    is_integer_col: bool,
+/// Column conversion mode resolved once from numeric/integer flags.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+enum CellValueKind {
+    Text,
+    Decimal,
+    Integer,
+}
+
+/// Cell normalizer specialized to one column's flags and value policy.
+///
+/// Build once per column, then call [`CellValueConverter::convert`] per cell so the
+/// flag dispatch and the missing-value sentinel are not re-resolved for every value.
+#[derive(Debug, Clone)]
+pub struct CellValueConverter<'a> {
+    kind: CellValueKind,
+    missing_cell: CellValue,
     should_keep_missing_values: bool,
-    value_policy: &XlsxValuePolicy,
-) -> CellValue {
-    if matches!(value, CellValue::None) {
-        return if should_keep_missing_values {
+    value_policy: &'a XlsxValuePolicy,
+}
+
+impl<'a> CellValueConverter<'a> {
+    pub fn new(
+        is_numeric_col: bool,
+        is_integer_col: bool,
+        should_keep_missing_values: bool,
+        value_policy: &'a XlsxValuePolicy,
+    ) -> Self {
+        let kind = match (is_numeric_col, is_integer_col) {
+            (false, _) => CellValueKind::Text,
+            (true, true) => CellValueKind::Integer,
+            (true, false) => CellValueKind::Decimal,
+        };
+        let missing_cell = if should_keep_missing_values {
             CellValue::String(value_policy.missing_value_str.clone())
         } else {
             CellValue::None
         };
+        Self {
+            kind,
+            missing_cell,
+            should_keep_missing_values,
+            value_policy,
+        }
     }
 
-    if !is_numeric_col {
-        return match value {
-            CellValue::String(s) => CellValue::String(s.clone()),
-            CellValue::Number(n) => CellValue::String(n.to_string()),
-            CellValue::None => CellValue::None,
-        };
-    }
-
-    if is_integer_col {
-        return match value {
-            CellValue::Number(_val) => {
-                convert_numeric_cell_to_integer(*_val, should_keep_missing_values, value_policy)
+    /// Normalize one cell value, reusing its string buffer when the text is kept.
+    pub fn convert(&self, value: CellValue) -> CellValue {
+        let should_keep_missing_values = self.should_keep_missing_values;
+        let value_policy = self.value_policy;
+        match (self.kind, value) {
+            (_, CellValue::None) => self.missing_cell.clone(),
+            (CellValueKind::Text, CellValue::String(s)) => CellValue::String(s),
+            (CellValueKind::Text, CellValue::Number(n)) => CellValue::String(n.to_string()),
+            (CellValueKind::Integer, CellValue::Number(_val)) => {
+                convert_numeric_cell_to_integer(_val, should_keep_missing_values, value_policy)
             }
-            CellValue::String(_val) => {
+            (CellValueKind::Integer, CellValue::String(_val)) => {
                 convert_string_cell_to_integer(_val, should_keep_missing_values, value_policy)
             }
-            CellValue::None => CellValue::None,
-        };
-    }
-
-    match value {
-        CellValue::Number(_val) => {
-            if _val.is_finite() {
-                CellValue::Number(*_val)
-            } else {
-                convert_infinite_number(*_val, should_keep_missing_values, value_policy)
+            (CellValueKind::Decimal, CellValue::Number(_val)) => {
+                if _val.is_finite() {
+                    CellValue::Number(_val)
+                } else {
+                    convert_infinite_number(_val, should_keep_missing_values, value_policy)
+                }
             }
-        }
-        CellValue::String(_val) => {
-            if let Ok(v) = _val.parse::<f64>() {
-                if v.is_finite() {
-                    CellValue::Number(v)
+            (CellValueKind::Decimal, CellValue::String(_val)) => {
+                if let Ok(v) = _val.parse::<f64>() {
+                    if v.is_finite() {
+                        CellValue::Number(v)
+                    } else {
+                        convert_infinite_number(v, should_keep_missing_values, value_policy)
+                    }
                 } else {
-                    convert_infinite_number(v, should_keep_missing_values, value_policy)
+                    CellValue::String(_val)
                 }
-            } else {
-                CellValue::String(_val.clone())
             }
         }
-        CellValue::None => CellValue::None,
     }
 }
 
+/// Normalize cell value according to numeric/integer flags and value policy.
+#[deprecated(note = "build a `CellValueConverter` once per column and call `convert` per cell")]
+pub fn convert_cell_value(
+    value: &CellValue,
+    is_numeric_col: bool,
+    is_integer_col: bool,
+    should_keep_missing_values: bool,
+    value_policy: &XlsxValuePolicy,
+) -> CellValue {
+    CellValueConverter::new(
+        is_numeric_col,
+        is_integer_col,
+        should_keep_missing_values,
+        value_policy,
+    )
+    .convert(value.clone())
+}
+
 // #endregion
 ////////////////////////////////////////////////////////////////////////////////
 // #region DataFrameLikeUtils
 
 /// Validate that `columns` has no duplicated names.
 pub fn validate_unique_columns(columns: &[&str]) -> Result<(), String> {
-    if columns.len() == columns.iter().collect::<BTreeSet<_>>().len() {
+    // One counting pass doubles as the fast path; positions are only tracked for duplicates.
+    let mut counts_by_name: BTreeMap<&str, usize> = BTreeMap::new();
+    for _name in columns {
+        *counts_by_name.entry(_name).or_default() += 1;
+    }
+    if counts_by_name.len() == columns.len() {
         return Ok(());
     }
 
-    let mut positions_by_name: BTreeMap<&str, Vec<usize>> = BTreeMap::new();
+    let mut positions_by_name: BTreeMap<&str, Vec<usize>> = counts_by_name
+        .into_iter()
+        .filter(|(_, _count)| *_count > 1)
+        .map(|(_name, _count)| (_name, Vec::with_capacity(_count)))
+        .collect();
     for (_idx, _name) in columns.iter().enumerate() {
-        positions_by_name.entry(_name).or_default().push(_idx);
+        if let Some(_positions) = positions_by_name.get_mut(_name) {
+            _positions.push(_idx);
+        }
     }
 
     let message = positions_by_name
         .iter()
-        .filter_map(|(_name, _positions)| {
-            if _positions.len() > 1 {
-                Some(format!(
-                    "{_name:?} x{} at indices {_positions:?}",
-                    _positions.len()
-                ))
-            } else {
-                None
-            }
+        .map(|(_name, _positions)| {
+            format!("{_name:?} x{} at indices {_positions:?}", _positions.len())
         })
         .collect::<Vec<_>>()
         .join("; ");
@@ -178,31 +219,84 @@ pub fn validate_unique_columns(columns: &[&str]) -> Result<(), String> {
     Err(format!("Duplicate column names detected: {message}"))
 }
 
-/// Resolve mixed refs (`name` or `index`) to sorted unique indices.
-pub fn select_sorted_indices_from_refs(
-    columns: &[&str],
-    refs: Option<&[ColumnIdentifier]>,
-) -> Result<Vec<usize>, String> {
-    let Some(refs) = refs else {
-        return Ok(vec![]);
-    };
+/// Build a `width`-long membership mask from column indices.
+///
+/// Indices outside `0..width` are ignored, matching set-membership semantics.
+pub fn create_column_mask(width: usize, indices: &[usize]) -> Vec<bool> {
+    let mut mask = vec![false; width];
+    for &_idx in indices {
+        if let Some(flag) = mask.get_mut(_idx) {
+            *flag = true;
+        }
+    }
+    mask
+}
+
+/// Column name -> index lookup shared by every ref list of one sheet.
+///
+/// The name map is built at most once, on the first name ref, so resolving the
+/// integer and decimal selectors of a wide sheet scans `columns` only once.
+#[derive(Debug, Clone)]
+pub struct ColumnIndexLookup<'a> {
+    columns: &'a [&'a str],
+    idx_by_name: Option<BTreeMap<&'a str, usize>>,
+}
+
+impl<'a> ColumnIndexLookup<'a> {
+    pub fn new(columns: &'a [&'a str]) -> Self {
+        Self {
+            columns,
+            idx_by_name: None,
+        }
+    }
 
-    let mut indices = BTreeSet::new();
-    for _ref_col in refs {
-        match _ref_col {
-            ColumnIdentifier::Index(idx) => {
-                indices.insert(*idx);
+    /// Resolve one column name to its first index.
+    pub fn get(&mut self, name: &str) -> Result<usize, String> {
+        let columns = self.columns;
+        let idx_by_name = self.idx_by_name.get_or_insert_with(|| {
+            let mut idx_by_name = BTreeMap::new();
+            for (_idx, _colname) in columns.iter().enumerate() {
+                idx_by_name.entry(*_colname).or_insert(_idx);
             }
-            ColumnIdentifier::Name(name) => {
-                let Some(idx) = columns.iter().position(|_colname| _colname == name) else {
-                    return Err(format!("Column not found: {name:?}"));
-                };
-                indices.insert(idx);
+            idx_by_name
+        });
+        idx_by_name
+            .get(name)
+            .copied()
+            .ok_or_else(|| format!("Column not found: {name:?}"))
+    }
+
+    /// Resolve mixed refs (`name` or `index`) to sorted unique indices.
+    pub fn select_sorted_indices(
+        &mut self,
+        refs: Option<&[ColumnIdentifier]>,
+    ) -> Result<Vec<usize>, String> {
+        let Some(refs) = refs else {
+            return Ok(vec![]);
+        };
+
+        let mut indices = Vec::with_capacity(refs.len());
+        for _ref_col in refs {
+            match _ref_col {
+                ColumnIdentifier::Index(idx) => indices.push(*idx),
+                ColumnIdentifier::Name(name) => indices.push(self.get(name)?),
             }
         }
+
+        // Sort and dedup the flat buffer in place instead of growing a tree set per ref.
+        indices.sort_unstable();
+        indices.dedup();
+        Ok(indices)
     }
+}
 
-    Ok(indices.into_iter().collect())
+/// Resolve mixed refs (`name` or `index`) to sorted unique indices.
+#[deprecated(note = "build a `ColumnIndexLookup` once per sheet and call `select_sorted_indices`")]
+pub fn select_sorted_indices_from_refs(
+    columns: &[&str],
+    refs: Option<&[ColumnIdentifier]>,
+) -> Result<Vec<usize>, String> {
+    ColumnIndexLookup::new(columns).select_sorted_indices(refs)
 }
 
 // #endregion
@@ -211,9 +305,25 @@ pub fn select_sorted_indices_from_refs(
 
 /// Derive row chunk size from dataframe width and chunk policy.
 pub fn calculate_row_chunk_size(width_df: usize, policy: &XlsxRowChunkPolicy) -> usize {
+    calculate_row_chunk_size_with_row_bytes(width_df, None, policy)
+}
+
+/// Derive row chunk size from dataframe width, estimated row bytes and chunk policy.
+///
+/// `target_bytes` takes precedence over width thresholds when a non-zero row size is known.
+pub fn calculate_row_chunk_size_with_row_bytes(
+    width_df: usize,
+    row_bytes_estimated: Option<usize>,
+    policy: &XlsxRowChunkPolicy,
+) -> usize {
     if let Some(fixed_size) = policy.fixed_size {
         return fixed_size;
     }
+    if let Some(target_bytes) = policy.target_bytes
+        && let Some(row_bytes) = row_bytes_estimated.filter(|val| *val > 0)
+    {
+        return usize::max(NROWS_CHUNK_MIN, target_bytes / row_bytes);
+    }
     if width_df >= policy.width_large {
         return policy.size_large;
     }
@@ -225,14 +335,38 @@ pub fn calculate_row_chunk_size(width_df: usize, policy: &XlsxRowChunkPolicy) ->
 
 /// Generate `(row_start, row_len)` chunks for `n_rows_total`.
 pub fn generate_row_chunks(n_rows_total: usize, size_rows_chunk: usize) -> Vec<(usize, usize)> {
-    let mut chunks = Vec::new();
-    let mut row_cursor = 0;
-    while row_cursor < n_rows_total {
-        let rows_per_chunk = usize::min(size_rows_chunk, n_rows_total - row_cursor);
-        chunks.push((row_cursor, rows_per_chunk));
-        row_cursor += rows_per_chunk;
-    }
-    chunks
+    iter_row_chunks(n_rows_total, size_rows_chunk).collect()
+}
+
+/// Lazily yield `(row_start, row_len)` chunks for `n_rows_total`.
+///
+/// A zero chunk size is treated as one row per chunk.
+pub fn iter_row_chunks(
+    n_rows_total: usize,
+    size_rows_chunk: usize,
+) -> impl Iterator<Item = (usize, usize)> {
+    let size_rows_chunk = usize::max(1, size_rows_chunk);
+    (0..n_rows_total)
+        .step_by(size_rows_chunk)
+        .map(move |row_start| {
+            (
+                row_start,
+                usize::min(size_rows_chunk, n_rows_total - row_start),
+            )
+        })
+}
+
+// #endregion
+////////////////////////////////////////////////////////////////////////////////
+// #region AutofitUtils
+
+/// Recorded width at which a column's autofit width already resolves to `width_cell_max`.
+///
+/// Body width scans can stop measuring a column once it reaches this width.
+pub fn calculate_autofit_width_saturated(policy_autofit: &AutofitPolicy) -> usize {
+    let width_min = usize::max(1, policy_autofit.width_cell_min);
+    let width_max = usize::min(255, usize::max(width_min, policy_autofit.width_cell_max));
+    width_max.saturating_sub(policy_autofit.width_cell_padding)
 }
 
 // #endregion
@@ -241,18 +375,23 @@ pub fn generate_row_chunks(n_rows_total: usize, size_rows_chunk: usize) -> Vec<(
 
 /// Replace invalid chars and trim to valid Excel sheet name.
 pub fn sanitize_sheet_name(name: &str, replace_to: &str) -> String {
-    let mut sheet_name = name.to_string();
-    for _illegal in SHEET_NAME_ILLEGAL_CHRS {
-        sheet_name = sheet_name.replace(_illegal, replace_to);
-    }
-    sheet_name = sheet_name.trim().to_string();
-    if sheet_name.is_empty() {
-        sheet_name = "Sheet".to_string();
-    }
+    // One replace pass with a char predicate instead of one full copy per illegal char.
+    let sheet_name = name.replace(is_sheet_name_illegal_char, replace_to);
+    let sheet_name = match sheet_name.trim() {
+        "" => "Sheet",
+        trimmed => trimmed,
+    };
 
     sheet_name.chars().take(LEN_SHEET_NAME_MAX).collect()
 }
 
+/// Every entry of `SHEET_NAME_ILLEGAL_CHRS` is a single char.
+fn is_sheet_name_illegal_char(ch: char) -> bool {
+    SHEET_NAME_ILLEGAL_CHRS
+        .iter()
+        .any(|_illegal| _illegal.starts_with(ch))
+}
+
 /// Split logical dataframe range into Excel-compliant sheet slices.
 pub fn plan_sheet_slices(
     height_df: usize,
@@ -349,141 +488,180 @@ fn create_sheet_identifier(base_name: &str, part_idx_1based: usize) -> String {
 
 /// Convert sorted indices to contiguous inclusive ranges.
 pub fn derive_contiguous_ranges(sorted_indices: &[usize]) -> Vec<(usize, usize)> {
-    if sorted_indices.is_empty() {
-        return vec![];
-    }
+    // `chunk_by` splits at each gap in one pass over the slice, without per-step run state.
+    sorted_indices
+        .chunk_by(|_prev, _next| *_next == *_prev + 1)
+        .map(|_run| (_run[0], _run[_run.len() - 1]))
+        .collect()
+}
 
-    let mut contiguous_ranges = Vec::new();
-    let mut idx_start = sorted_indices[0];
-    let mut idx_end = sorted_indices[0];
+/// Integer-coded header grid stored row-major in one contiguous buffer.
+///
+/// Code `0` is reserved for empty text; equal text always shares one code.
+struct HeaderCodeGrid {
+    codes: Vec<u32>,
+    row_count: usize,
+    col_count: usize,
+}
 
-    for _idx in &sorted_indices[1..] {
-        let idx = *_idx;
-        if idx == idx_end + 1 {
-            idx_end = idx;
-        } else {
-            contiguous_ranges.push((idx_start, idx_end));
-            idx_start = idx;
-            idx_end = idx;
-        }
+impl HeaderCodeGrid {
+    fn row(&self, row_idx: usize) -> &[u32] {
+        &self.codes[row_idx * self.col_count..(row_idx + 1) * self.col_count]
     }
 
-    contiguous_ranges.push((idx_start, idx_end));
-    contiguous_ranges
-}
+    fn col(&self, col_idx: usize) -> impl Iterator<Item = u32> + '_ {
+        self.codes
+            .iter()
+            .skip(col_idx)
+            .step_by(self.col_count.max(1))
+            .copied()
+    }
 
-/// Plan horizontal merges for repeated non-empty header text per row.
-pub fn plan_horizontal_merges(
-    header_grid: &[Vec<String>],
-) -> BTreeMap<usize, Vec<SheetHorizontalMerge>> {
-    let mut horizontal_merges_by_row = BTreeMap::new();
-    if header_grid.is_empty() {
-        return horizontal_merges_by_row;
+    fn clear(&mut self, row_idx: usize, col_idx: usize) {
+        self.codes[row_idx * self.col_count + col_idx] = 0;
     }
+}
 
+/// Integer-code header text so merge planners compare codes instead of strings.
+fn encode_header_grid(header_grid: &[Vec<String>]) -> HeaderCodeGrid {
     let row_count = header_grid.len();
-    let col_count = header_grid[0].len();
-
-    for _row_idx in header_grid.iter().enumerate().take(row_count) {
-        let (row_idx, _) = _row_idx;
-        let current_row = &header_grid[row_idx];
-        let mut col_idx = 0;
-
-        while col_idx < col_count {
-            let cell_value = &current_row[col_idx];
-            if cell_value.is_empty() {
-                col_idx += 1;
-                continue;
-            }
-
-            let mut col_idx_end = col_idx + 1;
-            while col_idx_end < col_count && current_row[col_idx_end] == *cell_value {
-                col_idx_end += 1;
-            }
+    let col_count = header_grid.first().map_or(0, Vec::len);
+    debug_assert!(
+        header_grid.iter().all(|_row| _row.len() == col_count),
+        "All rows must have the same number of columns."
+    );
 
-            if col_idx_end - col_idx > 1 {
-                horizontal_merges_by_row
-                    .entry(row_idx)
-                    .or_insert_with(Vec::new)
-                    .push(SheetHorizontalMerge {
-                        row_idx_start: row_idx,
-                        col_idx_start: col_idx,
-                        col_idx_end: col_idx_end - 1,
-                        text: cell_value.clone(),
-                    });
-            }
-            col_idx = col_idx_end;
+    // Hash interning: one hash per cell instead of O(log n) string comparisons.
+    let mut code_by_text: HashMap<&str, u32> = HashMap::with_capacity(row_count * col_count);
+    let mut codes = Vec::with_capacity(row_count * col_count);
+    for _text in header_grid.iter().flatten() {
+        if _text.is_empty() {
+            codes.push(0);
+            continue;
         }
+        let code_next = code_by_text.len() as u32 + 1;
+        codes.push(*code_by_text.entry(_text.as_str()).or_insert(code_next));
     }
 
-    horizontal_merges_by_row
+    HeaderCodeGrid {
+        codes,
+        row_count,
+        col_count,
+    }
 }
 
-/// Generate contiguous vertical runs `(col, row_start, row_end, text)`.
-fn _generate_vertical_runs(header_grid: &[Vec<String>]) -> Vec<(usize, usize, usize, String)> {
-    let mut run_collection = Vec::new();
-    if header_grid.is_empty() {
-        return run_collection;
+/// Run-length encode `codes` into inclusive `(start, end)` runs of repeated non-empty text.
+///
+/// Only runs spanning more than one cell are returned.
+fn derive_repeated_code_runs(codes: impl IntoIterator<Item = u32>) -> Vec<(usize, usize)> {
+    let mut repeated_runs = Vec::new();
+    let mut run_current: Option<(usize, u32)> = None;
+    let mut value_count = 0;
+
+    for (_idx, _code) in codes.into_iter().enumerate() {
+        value_count = _idx + 1;
+        match run_current {
+            Some((_, run_code)) if run_code == _code => continue,
+            Some((run_start, _)) if _idx - run_start > 1 => {
+                repeated_runs.push((run_start, _idx - 1));
+            }
+            _ => {}
+        }
+        run_current = if _code == 0 {
+            None
+        } else {
+            Some((_idx, _code))
+        };
     }
-    let Some(header_row_0) = header_grid.first() else {
-        return run_collection;
-    };
 
-    let row_count = header_grid.len();
-    let col_count = header_row_0.len();
+    if let Some((run_start, _)) = run_current
+        && value_count - run_start > 1
+    {
+        repeated_runs.push((run_start, value_count - 1));
+    }
+    repeated_runs
+}
 
-    debug_assert!(
-        header_grid.iter().all(|_row| _row.len() == col_count),
-        "All rows must have the same number of columns."
-    );
+fn _plan_horizontal_merges_from_codes(
+    header_grid: &[Vec<String>],
+    header_codes: &HeaderCodeGrid,
+) -> BTreeMap<usize, Vec<SheetHorizontalMerge>> {
+    let mut horizontal_merges_by_row = BTreeMap::new();
 
-    for _col_idx in header_row_0.iter().enumerate() {
-        let (col_idx, _) = _col_idx;
-        let mut row_idx_start = 0;
-        while row_idx_start < row_count {
-            let cell_value = &header_grid[row_idx_start][col_idx];
-            if cell_value.is_empty() {
-                row_idx_start += 1;
-                continue;
-            }
+    for row_idx in 0..header_codes.row_count {
+        let repeated_runs = derive_repeated_code_runs(header_codes.row(row_idx).iter().copied());
+        if repeated_runs.is_empty() {
+            continue;
+        }
+        horizontal_merges_by_row.insert(
+            row_idx,
+            repeated_runs
+                .into_iter()
+                .map(|(col_idx_start, col_idx_end)| SheetHorizontalMerge {
+                    row_idx_start: row_idx,
+                    col_idx_start,
+                    col_idx_end,
+                    text: header_grid[row_idx][col_idx_start].clone(),
+                })
+                .collect(),
+        );
+    }
 
-            let mut row_idx_next = row_idx_start + 1;
-            while row_idx_next < row_count && header_grid[row_idx_next][col_idx] == *cell_value {
-                row_idx_next += 1;
-            }
+    horizontal_merges_by_row
+}
 
-            let vertical_run_len = row_idx_next - row_idx_start;
-            if vertical_run_len > 1 {
-                run_collection.push((col_idx, row_idx_start, row_idx_next - 1, cell_value.clone()));
-            }
+/// Plan horizontal merges for repeated non-empty header text per row.
+pub fn plan_horizontal_merges(
+    header_grid: &[Vec<String>],
+) -> BTreeMap<usize, Vec<SheetHorizontalMerge>> {
+    _plan_horizontal_merges_from_codes(header_grid, &encode_header_grid(header_grid))
+}
 
-            row_idx_start = row_idx_next;
+/// Generate contiguous vertical runs `(col, row_start, row_end)`.
+fn _generate_vertical_runs(header_codes: &HeaderCodeGrid) -> Vec<(usize, usize, usize)> {
+    let mut run_collection = Vec::new();
+    for col_idx in 0..header_codes.col_count {
+        for (row_idx_start, row_idx_end) in derive_repeated_code_runs(header_codes.col(col_idx)) {
+            run_collection.push((col_idx, row_idx_start, row_idx_end));
         }
     }
 
     run_collection
 }
 
+/// Shared border cells for a vertical run: only the first and last rows differ.
+const BORDER_RUN_TOP: CellBorder = CellBorder {
+    top: 1,
+    bottom: 0,
+    left: 1,
+    right: 1,
+};
+const BORDER_RUN_MID: CellBorder = CellBorder {
+    top: 0,
+    bottom: 0,
+    left: 1,
+    right: 1,
+};
+const BORDER_RUN_BOTTOM: CellBorder = CellBorder {
+    top: 0,
+    bottom: 1,
+    left: 1,
+    right: 1,
+};
+
 /// Build border plan to simulate vertical merge visuals without merge cells.
 pub fn plan_vertical_visual_merge_borders(
     header_grid: &[Vec<String>],
 ) -> BTreeMap<(usize, usize), CellBorder> {
     let mut vertical_merge_border_plan = BTreeMap::new();
 
-    for _run in _generate_vertical_runs(header_grid) {
-        let (col_idx, row_start, row_end, _) = _run;
-        for _row_idx in row_start..=row_end {
-            let row_idx = _row_idx;
-            vertical_merge_border_plan.insert(
-                (row_idx, col_idx),
-                CellBorder {
-                    top: if row_idx == row_start { 1 } else { 0 },
-                    bottom: if row_idx == row_end { 1 } else { 0 },
-                    left: 1,
-                    right: 1,
-                },
-            );
+    // Runs always span at least two rows, so top and bottom never coincide.
+    for (col_idx, row_start, row_end) in _generate_vertical_runs(&encode_header_grid(header_grid)) {
+        vertical_merge_border_plan.insert((row_start, col_idx), BORDER_RUN_TOP);
+        for _row_idx in (row_start + 1)..row_end {
+            vertical_merge_border_plan.insert((_row_idx, col_idx), BORDER_RUN_MID);
         }
+        vertical_merge_border_plan.insert((row_end, col_idx), BORDER_RUN_BOTTOM);
     }
 
     vertical_merge_border_plan
@@ -491,13 +669,94 @@ pub fn plan_vertical_visual_merge_borders(
 
 /// Clear repeated text in vertical runs, keeping only first row text.
 pub fn apply_vertical_run_text_blankout(header_grid: &mut [Vec<String>]) {
-    for (col_idx, row_start, row_end, _) in _generate_vertical_runs(header_grid) {
-        for _row in header_grid.iter_mut().take(row_end + 1).skip(row_start + 1) {
-            _row[col_idx].clear();
+    let mut header_codes = encode_header_grid(header_grid);
+    _apply_vertical_run_blankout(header_grid, &mut header_codes);
+}
+
+fn _apply_vertical_run_blankout(
+    header_grid: &mut [Vec<String>],
+    header_codes: &mut HeaderCodeGrid,
+) {
+    for (col_idx, row_start, row_end) in _generate_vertical_runs(header_codes) {
+        for _row_idx in (row_start + 1)..=row_end {
+            header_grid[_row_idx][col_idx].clear();
+            header_codes.clear(_row_idx, col_idx);
         }
     }
 }
 
+/// Blank out vertical runs, then plan horizontal merges on the blanked grid.
+///
+/// The grid is encoded once and shared by both planners.
+pub fn plan_header_merges(
+    header_grid: &mut [Vec<String>],
+) -> BTreeMap<usize, Vec<SheetHorizontalMerge>> {
+    let mut header_codes = encode_header_grid(header_grid);
+    _apply_vertical_run_blankout(header_grid, &mut header_codes);
+    _plan_horizontal_merges_from_codes(header_grid, &header_codes)
+}
+
+/// Header grid with merges planned once for the full sheet width.
+///
+/// Vertical runs are column-local and horizontal runs are maximal, so each column
+/// slice only needs to clip the full-width plan instead of re-planning its sub-grid.
+#[derive(Debug, Clone)]
+pub struct HeaderMergePlan {
+    header_grid: Vec<Vec<String>>,
+    horizontal_merges_by_row: BTreeMap<usize, Vec<SheetHorizontalMerge>>,
+}
+
+impl HeaderMergePlan {
+    /// Plan merges over `header_grid`; without `should_merge` the grid is kept verbatim.
+    pub fn new(header_grid: &[Vec<String>], should_merge: bool) -> Self {
+        let mut header_grid = header_grid.to_vec();
+        let horizontal_merges_by_row = if should_merge {
+            plan_header_merges(&mut header_grid)
+        } else {
+            BTreeMap::new()
+        };
+        Self {
+            header_grid,
+            horizontal_merges_by_row,
+        }
+    }
+
+    /// Header text to write, with vertical runs blanked out when merging.
+    pub fn header_grid(&self) -> &[Vec<String>] {
+        &self.header_grid
+    }
+
+    /// Horizontal merges clipped to `[col_start_inclusive, col_end_exclusive)` and
+    /// rebased onto the slice; runs clipped down to one cell are dropped.
+    pub fn slice_horizontal_merges(
+        &self,
+        col_start_inclusive: usize,
+        col_end_exclusive: usize,
+    ) -> BTreeMap<usize, Vec<SheetHorizontalMerge>> {
+        let mut horizontal_merges_by_row = BTreeMap::new();
+        for (row_idx, merges) in &self.horizontal_merges_by_row {
+            let merges_slice = merges
+                .iter()
+                .filter_map(|merge| {
+                    let col_idx_start = usize::max(merge.col_idx_start, col_start_inclusive);
+                    let col_idx_end = usize::min(merge.col_idx_end + 1, col_end_exclusive);
+                    (col_idx_end > col_idx_start + 1).then(|| SheetHorizontalMerge {
+                        row_idx_start: merge.row_idx_start,
+                        col_idx_start: col_idx_start - col_start_inclusive,
+                        col_idx_end: col_idx_end - 1 - col_start_inclusive,
+                        text: merge.text.clone(),
+                    })
+                })
+                .collect::<Vec<_>>();
+            if !merges_slice.is_empty() {
+                horizontal_merges_by_row.insert(*row_idx, merges_slice);
+            }
+        }
+
+        horizontal_merges_by_row
+    }
+}
+
 /// Build lookup map for cells covered by a horizontal merge (excluding anchor).
 pub fn create_horizontal_merge_tracker(
     row_horizontal_merge_mapping: &BTreeMap<usize, Vec<SheetHorizontalMerge>>,
@@ -518,6 +777,34 @@ pub fn create_horizontal_merge_tracker(
     merged_cells_tracker
 }
 
+/// Build per-row masks of cells covered by a horizontal merge (excluding anchor).
+///
+/// `masks[row][col]` is `true` when the cell must be skipped, so header writes
+/// test a flat slice instead of probing a `(row, col)` set per cell.
+pub(crate) fn create_horizontal_merge_mask(
+    row_horizontal_merge_mapping: &BTreeMap<usize, Vec<SheetHorizontalMerge>>,
+    row_count: usize,
+    col_count: usize,
+) -> Vec<Vec<bool>> {
+    let mut merged_cells_masks = vec![vec![false; col_count]; row_count];
+
+    for _row_merges in row_horizontal_merge_mapping {
+        let (row_idx, horizontal_merges) = _row_merges;
+        let Some(row_mask) = merged_cells_masks.get_mut(*row_idx) else {
+            continue;
+        };
+        for _merge in horizontal_merges {
+            let merge = _merge;
+            let col_idx_end = merge.col_idx_end.min(col_count.saturating_sub(1));
+            if merge.col_idx_start < col_idx_end {
+                row_mask[(merge.col_idx_start + 1)..=col_idx_end].fill(true);
+            }
+        }
+    }
+
+    merged_cells_masks
+}
+
 // #endregion
 ////////////////////////////////////////////////////////////////////////////////
 
@@ -527,6 +814,7 @@ mod tests {
     use crate::constant::ColumnIdentifier;
 
     #[test]
+    #[allow(deprecated)]
     fn test_select_sorted_indices_from_refs_respects_typed_selectors() {
         let columns: Vec<&str> = vec!["x", "0", "y"];
 
@@ -544,6 +832,27 @@ mod tests {
     }
 
     #[test]
+    #[allow(deprecated)]
+    fn test_select_sorted_indices_from_refs_sorts_and_dedups() {
+        let columns: Vec<&str> = vec!["a", "b", "c", "d"];
+
+        assert_eq!(
+            select_sorted_indices_from_refs(
+                &columns,
+                Some(&[
+                    ColumnIdentifier::Index(3),
+                    ColumnIdentifier::Name("b".to_string()),
+                    ColumnIdentifier::Index(1),
+                    ColumnIdentifier::Name("d".to_string()),
+                ]),
+            )
+            .unwrap(),
+            vec![1, 3]
+        );
+    }
+
+    #[test]
+    #[allow(deprecated)]
     fn test_select_sorted_indices_from_refs_rejects_missing_name() {
         let columns = vec!["x", "y"];
 
@@ -556,6 +865,71 @@ mod tests {
         assert!(err.contains("Column not found"));
     }
 
+    #[test]
+    fn test_column_index_lookup_shares_names_across_selectors() {
+        let columns: Vec<&str> = vec!["a", "b", "c", "d"];
+        let mut lookup = ColumnIndexLookup::new(&columns);
+
+        assert_eq!(
+            lookup
+                .select_sorted_indices(Some(&[
+                    ColumnIdentifier::Name("d".to_string()),
+                    ColumnIdentifier::Index(1),
+                    ColumnIdentifier::Name("d".to_string()),
+                ]))
+                .unwrap(),
+            vec![1, 3]
+        );
+        assert_eq!(
+            lookup
+                .select_sorted_indices(Some(&[ColumnIdentifier::Name("a".to_string())]))
+                .unwrap(),
+            vec![0]
+        );
+        assert_eq!(
+            lookup.select_sorted_indices(None).unwrap(),
+            Vec::<usize>::new()
+        );
+    }
+
+    #[test]
+    fn test_column_index_lookup_keeps_first_duplicate_name() {
+        let columns = vec!["a", "b", "a"];
+        let mut lookup = ColumnIndexLookup::new(&columns);
+
+        assert_eq!(lookup.get("a").unwrap(), 0);
+        assert_eq!(lookup.get("b").unwrap(), 1);
+        assert!(lookup.get("c").is_err());
+    }
+
+    #[test]
+    fn test_encode_header_grid_shares_codes_and_runs_skip_empty_text() {
+        let grid = vec![
+            vec!["A", "A", "", "", "B", "A"]
+                .into_iter()
+                .map(String::from)
+                .collect::<Vec<_>>(),
+            vec!["B", "", "", "A", "A", "A"]
+                .into_iter()
+                .map(String::from)
+                .collect::<Vec<_>>(),
+        ];
+
+        let header_codes = encode_header_grid(&grid);
+
+        assert_eq!(header_codes.row(0), &[1, 1, 0, 0, 2, 1]);
+        assert_eq!(header_codes.row(1), &[2, 0, 0, 1, 1, 1]);
+        assert_eq!(header_codes.col(4).collect::<Vec<_>>(), vec![2, 1]);
+        assert_eq!(
+            derive_repeated_code_runs(header_codes.row(0).iter().copied()),
+            vec![(0, 1)]
+        );
+        assert_eq!(
+            derive_repeated_code_runs(header_codes.row(1).iter().copied()),
+            vec![(3, 5)]
+        );
+    }
+
     #[test]
     fn test_generate_vertical_runs_detects_only_contiguous_non_empty_runs() {
         let grid = vec![
@@ -568,15 +942,224 @@ mod tests {
         ];
 
         assert_eq!(
-            _generate_vertical_runs(&grid),
-            vec![
-                (0, 0, 2, "A".to_string()),
-                (0, 4, 5, "B".to_string()),
-                (1, 2, 4, "X".to_string())
-            ]
+            _generate_vertical_runs(&encode_header_grid(&grid)),
+            vec![(0, 0, 2), (0, 4, 5), (1, 2, 4)]
+        );
+    }
+
+    #[test]
+    fn test_plan_horizontal_merges_skips_empty_and_single_cells() {
+        let grid = vec![
+            vec!["A", "A", "", "", "B", "C", "C", "C"]
+                .into_iter()
+                .map(String::from)
+                .collect::<Vec<_>>(),
+            vec!["X", "Y", "Y", "Y", "Y", "", "Z", "Z"]
+                .into_iter()
+                .map(String::from)
+                .collect::<Vec<_>>(),
+        ];
+
+        let merges_by_row = plan_horizontal_merges(&grid);
+        let spans = merges_by_row
+            .iter()
+            .flat_map(|(row_idx, merges)| {
+                merges
+                    .iter()
+                    .map(move |merge| (*row_idx, merge.col_idx_start, merge.col_idx_end))
+            })
+            .collect::<Vec<_>>();
+
+        assert_eq!(spans, vec![(0, 0, 1), (0, 5, 7), (1, 1, 4), (1, 6, 7)]);
+        assert_eq!(merges_by_row[&0][1].text, "C");
+    }
+
+    #[test]
+    #[allow(deprecated)]
+    fn test_convert_cell_value_maps_non_finite_numbers_to_policy_strings() {
+        let value_policy = XlsxValuePolicy::default();
+        let convert =
+            |x: f64| convert_cell_value(&CellValue::Number(x), true, false, true, &value_policy);
+
+        assert_eq!(convert(f64::NAN), CellValue::String("NaN".to_string()));
+        assert_eq!(convert(f64::INFINITY), CellValue::String("Inf".to_string()));
+        assert_eq!(
+            convert(f64::NEG_INFINITY),
+            CellValue::String("-Inf".to_string())
+        );
+        assert_eq!(
+            convert_cell_value(
+                &CellValue::Number(f64::NAN),
+                true,
+                false,
+                false,
+                &value_policy
+            ),
+            CellValue::None
+        );
+    }
+
+    #[test]
+    fn test_cell_value_converter_maps_non_finite_numbers_to_policy_strings() {
+        let value_policy = XlsxValuePolicy::default();
+        let converter = CellValueConverter::new(true, false, true, &value_policy);
+        let convert = |x: f64| converter.convert(CellValue::Number(x));
+
+        assert_eq!(convert(f64::NAN), CellValue::String("NaN".to_string()));
+        assert_eq!(convert(f64::INFINITY), CellValue::String("Inf".to_string()));
+        assert_eq!(
+            convert(f64::NEG_INFINITY),
+            CellValue::String("-Inf".to_string())
+        );
+        assert_eq!(
+            converter.convert(CellValue::None),
+            CellValue::String("NA".to_string())
+        );
+        assert_eq!(
+            CellValueConverter::new(true, false, false, &value_policy)
+                .convert(CellValue::Number(f64::NAN)),
+            CellValue::None
+        );
+    }
+
+    #[test]
+    fn test_sanitize_sheet_name_replaces_trims_and_truncates() {
+        assert_eq!(
+            sanitize_sheet_name("a*b:c?d/e\\f[g]h", "_"),
+            "a_b_c_d_e_f_g_h"
+        );
+        assert_eq!(sanitize_sheet_name("  [x]  ", "-"), "-x-");
+        assert_eq!(sanitize_sheet_name("   ", "_"), "Sheet");
+        assert_eq!(
+            sanitize_sheet_name(&"n".repeat(40), "_").len(),
+            LEN_SHEET_NAME_MAX
+        );
+    }
+
+    #[test]
+    fn test_derive_contiguous_ranges_splits_at_gaps() {
+        assert!(derive_contiguous_ranges(&[]).is_empty());
+        assert_eq!(derive_contiguous_ranges(&[4]), vec![(4, 4)]);
+        assert_eq!(
+            derive_contiguous_ranges(&[0, 1, 2, 5, 7, 8]),
+            vec![(0, 2), (5, 5), (7, 8)]
+        );
+    }
+
+    #[test]
+    fn test_validate_unique_columns_reports_only_duplicates() {
+        assert!(validate_unique_columns(&["a", "b", "c"]).is_ok());
+
+        let err = validate_unique_columns(&["b", "a", "b", "c", "a", "b"]).unwrap_err();
+        assert_eq!(
+            err,
+            "Duplicate column names detected: \"a\" x2 at indices [1, 4]; \"b\" x3 at indices [0, 2, 5]"
+        );
+    }
+
+    #[test]
+    fn test_calculate_row_chunk_size_prefers_target_bytes_when_row_size_known() {
+        let policy = XlsxRowChunkPolicy {
+            target_bytes: Some(8 * 1024 * 1024),
+            ..Default::default()
+        };
+        assert_eq!(
+            calculate_row_chunk_size_with_row_bytes(10, Some(1024), &policy),
+            8192
+        );
+        assert_eq!(
+            calculate_row_chunk_size_with_row_bytes(10, Some(1 << 20), &policy),
+            256
+        );
+        assert_eq!(
+            calculate_row_chunk_size_with_row_bytes(10, Some(0), &policy),
+            10_000
+        );
+        assert_eq!(calculate_row_chunk_size(10, &policy), 10_000);
+
+        let policy_fixed = XlsxRowChunkPolicy {
+            fixed_size: Some(7),
+            ..policy
+        };
+        assert_eq!(
+            calculate_row_chunk_size_with_row_bytes(10, Some(1024), &policy_fixed),
+            7
+        );
+    }
+
+    #[test]
+    fn test_create_column_mask_ignores_out_of_range_indices() {
+        assert_eq!(
+            create_column_mask(4, &[3, 1, 9]),
+            vec![false, true, false, true]
+        );
+        assert!(create_column_mask(0, &[0]).is_empty());
+    }
+
+    #[test]
+    fn test_generate_row_chunks_covers_rows_with_short_tail() {
+        assert_eq!(generate_row_chunks(10, 4), vec![(0, 4), (4, 4), (8, 2)]);
+        assert!(generate_row_chunks(0, 4).is_empty());
+        assert_eq!(
+            iter_row_chunks(10, 4).collect::<Vec<_>>(),
+            generate_row_chunks(10, 4)
+        );
+    }
+
+    #[test]
+    fn test_calculate_autofit_width_saturated_subtracts_padding_from_max() {
+        let policy = AutofitPolicy::default();
+        assert_eq!(calculate_autofit_width_saturated(&policy), 58);
+
+        let policy_wide_padding = AutofitPolicy {
+            width_cell_max: 300,
+            width_cell_padding: 400,
+            ..policy
+        };
+        assert_eq!(calculate_autofit_width_saturated(&policy_wide_padding), 0);
+    }
+
+    #[test]
+    fn test_create_horizontal_merge_tracker_excludes_anchor_cells() {
+        let grid = vec![
+            vec!["A", "A", "A", "B", "C", "C"]
+                .into_iter()
+                .map(String::from)
+                .collect::<Vec<_>>(),
+        ];
+
+        let merges = plan_horizontal_merges(&grid);
+
+        assert_eq!(
+            create_horizontal_merge_tracker(&merges)
+                .into_keys()
+                .collect::<Vec<_>>(),
+            vec![(0, 1), (0, 2), (0, 5)]
+        );
+        assert_eq!(
+            create_horizontal_merge_mask(&merges, 1, 6),
+            vec![vec![false, true, true, false, false, true]]
         );
     }
 
+    #[test]
+    fn test_plan_vertical_visual_merge_borders_marks_run_edges() {
+        let grid = vec![
+            vec!["A".to_string(), "x".to_string()],
+            vec!["A".to_string(), "y".to_string()],
+            vec!["A".to_string(), "y".to_string()],
+        ];
+
+        let plan = plan_vertical_visual_merge_borders(&grid);
+
+        assert_eq!(plan.len(), 5);
+        assert_eq!(plan[&(0, 0)], BORDER_RUN_TOP);
+        assert_eq!(plan[&(1, 0)], BORDER_RUN_MID);
+        assert_eq!(plan[&(2, 0)], BORDER_RUN_BOTTOM);
+        assert_eq!(plan[&(1, 1)], BORDER_RUN_TOP);
+        assert_eq!(plan[&(2, 1)], BORDER_RUN_BOTTOM);
+    }
+
     #[test]
     fn test_apply_vertical_run_text_blankout() {
         let mut grid = vec![
@@ -599,4 +1182,63 @@ mod tests {
         assert_eq!(grid[2][1], "");
         assert_eq!(grid[3][1], "");
     }
+
+    #[test]
+    fn test_plan_header_merges_matches_blankout_then_horizontal_plan() {
+        let grid = vec![
+            vec!["G", "G", "H", "H"]
+                .into_iter()
+                .map(String::from)
+                .collect::<Vec<_>>(),
+            vec!["G", "G", "x", "y"]
+                .into_iter()
+                .map(String::from)
+                .collect::<Vec<_>>(),
+        ];
+
+        let mut grid_expected = grid.clone();
+        apply_vertical_run_text_blankout(&mut grid_expected);
+        let merges_expected = plan_horizontal_merges(&grid_expected);
+
+        let mut grid_actual = grid;
+        let merges_actual = plan_header_merges(&mut grid_actual);
+
+        assert_eq!(grid_actual, grid_expected);
+        assert_eq!(grid_actual[1], vec!["", "", "x", "y"]);
+        assert_eq!(merges_actual, merges_expected);
+    }
+
+    #[test]
+    fn test_header_merge_plan_slices_match_per_slice_planning() {
+        let grid = vec![
+            vec!["G", "G", "G", "H", "H"]
+                .into_iter()
+                .map(String::from)
+                .collect::<Vec<_>>(),
+            vec!["G", "a", "b", "c", "c"]
+                .into_iter()
+                .map(String::from)
+                .collect::<Vec<_>>(),
+        ];
+        let plan = HeaderMergePlan::new(&grid, true);
+
+        for (col_start, col_end) in [(0, 5), (0, 2), (1, 3), (2, 4), (3, 5), (4, 5)] {
+            let mut grid_slice = grid
+                .iter()
+                .map(|row| row[col_start..col_end].to_vec())
+                .collect::<Vec<_>>();
+            let merges_expected = plan_header_merges(&mut grid_slice);
+
+            let grid_actual = plan
+                .header_grid()
+                .iter()
+                .map(|row| row[col_start..col_end].to_vec())
+                .collect::<Vec<_>>();
+            assert_eq!(grid_actual, grid_slice);
+            assert_eq!(
+                plan.slice_horizontal_merges(col_start, col_end),
+                merges_expected
+            );
+        }
+    }
 }
@@ -1,6 +1,7 @@
 //! XLSX writer kernel that converts DataFrame IPC into workbook output.
 
-use std::collections::{BTreeMap, BTreeSet};
+use std::borrow::Cow;
+use std::collections::{BTreeMap, BTreeSet, HashMap};
 use std::io::Cursor;
 use std::path::PathBuf;
 
@@ -9,19 +10,21 @@ use arrow::array::{
 };
 use arrow::datatypes::{ArrowDataType, ArrowSchema};
 use arrow::record_batch::RecordBatchT;
-use polars::prelude::{AnyValue, DataFrame, IpcReader, SerReader};
+use polars::prelude::{AnyValue, Column, DataFrame, DataType, IpcReader, SerReader};
 use rust_xlsxwriter::{Format, FormatAlign, FormatBorder, Workbook, Worksheet, XlsxError};
 
-use crate::constant::{ColumnIdentifier, LEN_SHEET_NAME_MAX, NCOLS_SHEET_MAX, NROWS_SHEET_MAX};
+use crate::constant::{
+    ColumnIdentifier, LEN_SHEET_NAME_MAX, NBYTES_STRING_CELL_ESTIMATED, NCOLS_SHEET_MAX,
+    NROWS_SHEET_MAX,
+};
 use crate::spec::{
     AutofitMode, AutofitPolicy, CellFormatPatch, CellValue, ColumnFormatPlan, ScientificPolicy,
     ScientificScope, SheetSlice, XlsxReport, XlsxValuePolicy, XlsxWriteOptions,
 };
 use crate::util::{
-    apply_vertical_run_text_blankout, calculate_row_chunk_size, convert_cell_value,
-    create_horizontal_merge_tracker, generate_row_chunks, plan_horizontal_merges,
-    plan_sheet_slices, sanitize_sheet_name, select_sorted_indices_from_refs,
-    validate_unique_columns,
+    CellValueConverter, ColumnIndexLookup, HeaderMergePlan, calculate_autofit_width_saturated,
+    calculate_row_chunk_size_with_row_bytes, create_column_mask, create_horizontal_merge_mask,
+    iter_row_chunks, plan_sheet_slices, sanitize_sheet_name, validate_unique_columns,
 };
 
 /// Per-sheet call options (aligned with Python `XlsxWriter.write_sheet` kwargs).
@@ -71,6 +74,14 @@ pub type XlsxRecordBatch = RecordBatchT<Box<dyn ArrowArray>>;
 /// Fallible Arrow record batch item accepted by bridge streaming sessions.
 pub type XlsxRecordBatchResult = Result<XlsxRecordBatch, String>;
 
+/// Cell source for one streamed batch.
+enum XlsxBatchCells {
+    /// Batch whose columns are all read directly from Arrow buffers.
+    Arrow(XlsxRecordBatch),
+    /// Batch materialized as a DataFrame for dtypes without a direct Arrow reader.
+    DataFrame(DataFrame),
+}
+
 #[derive(Debug, Clone)]
 pub struct XlsxSheetPlan {
     col_names: Vec<String>,
@@ -86,20 +97,25 @@ pub struct XlsxSheetPlan {
     should_keep_missing_values: bool,
 }
 
+/// Per-column numeric/integer/scientific flags, resolved once per sheet part.
+#[derive(Debug, Clone, Default)]
+struct XlsxColumnFlags {
+    is_numeric_by_col: Vec<bool>,
+    is_integer_by_col: Vec<bool>,
+    is_scientific_candidate_by_col: Vec<bool>,
+}
+
 struct XlsxSheetRuntime {
     worksheet_index: usize,
     sheet_slice: SheetSlice,
     data_formats_by_col: Vec<Format>,
     fmt_scientific: Format,
-    numeric_cols_idx: BTreeSet<usize>,
-    integer_cols_idx: BTreeSet<usize>,
-    decimal_cols_idx: BTreeSet<usize>,
-    is_decimal_explicit: bool,
+    col_flags: XlsxColumnFlags,
 }
 
 struct XlsxSinglePassPlan {
     col_names: Vec<String>,
-    header_grid: Vec<Vec<String>>,
+    header_merge_plan: HeaderMergePlan,
     cols_idx_numeric: Vec<usize>,
     cols_idx_integer: Vec<usize>,
     cols_idx_decimal_specified: Vec<usize>,
@@ -126,9 +142,10 @@ struct XlsxSheetPlanBuilder<'a> {
     cols_idx_numeric: Vec<usize>,
     cols_idx_integer: Vec<usize>,
     cols_idx_decimal_specified: Vec<usize>,
+    col_flags: XlsxColumnFlags,
     header_widths_by_col: Vec<usize>,
     body_widths_by_col: Vec<usize>,
-    rows_seen_for_autofit: usize,
+    rows_autofit_remaining: usize,
     should_keep_missing_values: bool,
 }
 
@@ -139,8 +156,10 @@ pub struct XlsxWriter {
     fmt_text: CellFormatPatch,
     fmt_integer: CellFormatPatch,
     fmt_decimal: CellFormatPatch,
-    fmt_scientific: CellFormatPatch,
-    fmt_header: CellFormatPatch,
+    /// Scientific format merged with the base patch, resolved once per writer.
+    fmt_scientific: Format,
+    /// Header format, resolved once per writer.
+    fmt_header: Format,
     options_write: XlsxWriteOptions,
     existing_sheet_names: BTreeSet<String>,
     reports: Vec<XlsxReport>,
@@ -161,6 +180,11 @@ impl XlsxWriter {
         fmt_header: CellFormatPatch,
         options_write: XlsxWriteOptions,
     ) -> Self {
+        let fmt_scientific = create_rust_xlsx_format(&merge_base_format_patch(
+            &fmt_scientific,
+            &options_write.base_format_patch,
+        ));
+        let fmt_header = create_rust_xlsx_format(&fmt_header);
         Self {
             path_file_out,
             workbook: Workbook::new(),
@@ -353,6 +377,8 @@ impl XlsxWriter {
             .collect::<Vec<_>>();
         let header_row_count = plan.header_grid.len();
         let value_policy = self.options_write.value_policy.clone();
+        let header_merge_plan =
+            HeaderMergePlan::new(&plan.header_grid, options.should_merge_header);
 
         let mut report = XlsxReport {
             sheets: vec![],
@@ -400,30 +426,13 @@ impl XlsxWriter {
                 options_write: &self.options_write,
             });
 
-            let data_formats_by_col: Vec<Format> = column_format_plan
-                .fmts_by_col
-                .iter()
-                .map(create_rust_xlsx_format)
-                .collect();
-            let fmt_scientific_patch = self
-                .fmt_scientific
-                .merge(&self.options_write.base_format_patch);
-            let fmt_scientific = create_rust_xlsx_format(&fmt_scientific_patch);
-            let fmt_header = create_rust_xlsx_format(&self.fmt_header);
-
-            let header_grid_slice = plan
-                .header_grid
-                .iter()
-                .map(|row| {
-                    row[sheet_slice.col_start_inclusive..sheet_slice.col_end_exclusive].to_vec()
-                })
-                .collect::<Vec<_>>();
-
+            let data_formats_by_col = create_rust_xlsx_formats(&column_format_plan.fmts_by_col);
             write_header(
                 worksheet,
-                header_grid_slice,
-                options.should_merge_header,
-                &fmt_header,
+                &header_merge_plan,
+                sheet_slice.col_start_inclusive,
+                sheet_slice.col_end_exclusive,
+                &self.fmt_header,
             )?;
 
             worksheet
@@ -446,11 +455,14 @@ impl XlsxWriter {
                 worksheet_index,
                 sheet_slice: sheet_slice.clone(),
                 data_formats_by_col,
-                fmt_scientific,
-                numeric_cols_idx: cols_idx_numeric_slice.iter().copied().collect(),
-                integer_cols_idx: cols_idx_integer_slice.iter().copied().collect(),
-                decimal_cols_idx: cols_idx_decimal_slice.iter().copied().collect(),
-                is_decimal_explicit: !cols_idx_decimal_slice.is_empty(),
+                fmt_scientific: self.fmt_scientific.clone(),
+                col_flags: XlsxColumnFlags::new(
+                    sheet_slice.col_end_exclusive - sheet_slice.col_start_inclusive,
+                    &cols_idx_numeric_slice,
+                    &cols_idx_integer_slice,
+                    &cols_idx_decimal_slice,
+                    &options.policy_scientific,
+                ),
             });
 
             report.sheets.push(SheetSlice {
@@ -464,18 +476,16 @@ impl XlsxWriter {
 
         let mut row_offset = 0usize;
         for batch in batches {
-            let batch = batch?;
-            let df_batch = dataframe_from_record_batch(batch)?;
-            let batch_col_names = df_batch.get_column_names_str();
-            if batch_col_names != col_names_ref {
+            let batch = XlsxBatchCells::from_record_batch(batch?)?;
+            if !batch.has_col_names(&col_names_ref) {
                 return Err("All record batches must have identical column names.".to_string());
             }
 
             for runtime in &runtime_sheets {
-                write_record_batch_to_runtime_sheet(
+                write_batch_to_runtime_sheet(
                     &mut self.workbook,
                     runtime,
-                    &df_batch,
+                    &batch,
                     row_offset,
                     header_row_count,
                     plan.should_keep_missing_values,
@@ -483,7 +493,7 @@ impl XlsxWriter {
                     &options.policy_scientific,
                 )?;
             }
-            row_offset += df_batch.height();
+            row_offset += batch.height();
         }
 
         if row_offset != plan.height_body {
@@ -514,14 +524,17 @@ impl XlsxWriter {
             );
         };
         let first_batch = first_batch_result?;
+        let first_batch_len = first_batch.len();
         let plan =
             self.create_single_pass_plan(&first_batch, sheet_name, header_grid_custom, options)?;
+        // Sanitize once per sheet; every row/column part reuses the same base name.
+        let sheet_name_base = sanitize_sheet_name(sheet_name, "_");
         let col_names_ref = plan
             .col_names
             .iter()
             .map(String::as_str)
             .collect::<Vec<_>>();
-        let header_row_count = plan.header_grid.len();
+        let header_row_count = plan.header_merge_plan.header_grid().len();
         let max_data_rows = NROWS_SHEET_MAX
             .checked_sub(header_row_count)
             .ok_or_else(|| {
@@ -545,8 +558,8 @@ impl XlsxWriter {
         self.write_single_pass_batch(
             &plan,
             options,
-            sheet_name,
-            &first_batch,
+            &sheet_name_base,
+            &XlsxBatchCells::from_record_batch(first_batch)?,
             &col_names_ref,
             rows_written,
             max_data_rows,
@@ -555,15 +568,16 @@ impl XlsxWriter {
             &mut runtime_sheets,
             &mut report,
         )?;
-        rows_written += first_batch.len();
+        rows_written += first_batch_len;
 
         for batch in iter_batches {
             let batch = batch?;
+            let batch_len = batch.len();
             self.write_single_pass_batch(
                 &plan,
                 options,
-                sheet_name,
-                &batch,
+                &sheet_name_base,
+                &XlsxBatchCells::from_record_batch(batch)?,
                 &col_names_ref,
                 rows_written,
                 max_data_rows,
@@ -572,14 +586,14 @@ impl XlsxWriter {
                 &mut runtime_sheets,
                 &mut report,
             )?;
-            rows_written += batch.len();
+            rows_written += batch_len;
         }
 
         if rows_written == 0 {
             self.ensure_single_pass_runtime_sheets(
                 &plan,
                 options,
-                sheet_name,
+                &sheet_name_base,
                 0,
                 max_data_rows,
                 &mut active_row_start,
@@ -624,27 +638,28 @@ impl XlsxWriter {
             None => vec![col_names.clone()],
         };
 
-        let cols_idx_numeric = if self.options_write.should_infer_numeric_cols {
-            select_numeric_column_indices_from_arrow_schema(schema)
-        } else {
-            vec![]
-        };
-        let cols_idx_integer_inferred = if self.options_write.should_infer_integer_cols {
-            select_integer_column_indices_from_arrow_schema(schema, &cols_idx_numeric)
-        } else {
-            vec![]
-        };
+        let (cols_idx_numeric, cols_idx_integer_inferred) = select_inferred_column_indices(
+            schema
+                .iter_values()
+                .map(|field| classify_arrow_dtype(field.dtype())),
+            &self.options_write,
+        );
+        let mut col_index_lookup = ColumnIndexLookup::new(&col_names_ref);
         let cols_idx_integer_specified =
-            select_sorted_indices_from_refs(&col_names_ref, options.cols_integer.as_deref())?;
+            col_index_lookup.select_sorted_indices(options.cols_integer.as_deref())?;
         let cols_idx_decimal_specified =
-            select_sorted_indices_from_refs(&col_names_ref, options.cols_decimal.as_deref())?;
+            col_index_lookup.select_sorted_indices(options.cols_decimal.as_deref())?;
         let cols_idx_integer = if cols_idx_integer_specified.is_empty() {
             cols_idx_integer_inferred
         } else {
             cols_idx_integer_specified
         };
 
-        let rows_chunk = calculate_row_chunk_size(width_body, &self.options_write.row_chunk_policy);
+        let rows_chunk = calculate_row_chunk_size_with_row_bytes(
+            width_body,
+            Some(estimate_arrow_row_bytes(schema)),
+            &self.options_write.row_chunk_policy,
+        );
         if rows_chunk == 0 {
             return Err("row_chunk_policy resolved to 0 rows; expected >= 1.".to_string());
         }
@@ -663,15 +678,7 @@ impl XlsxWriter {
                     }
                     header_widths_by_col[col_idx] = usize::max(
                         header_widths_by_col[col_idx],
-                        estimate_width_len(
-                            &CellValue::String(value.clone()),
-                            false,
-                            false,
-                            false,
-                            &options.policy_scientific,
-                            should_keep_missing_values,
-                            &self.options_write.value_policy,
-                        ),
+                        estimate_unicode_string_width(value),
                     );
                 }
             }
@@ -680,7 +687,7 @@ impl XlsxWriter {
 
         Ok(XlsxSinglePassPlan {
             col_names,
-            header_grid,
+            header_merge_plan: HeaderMergePlan::new(&header_grid, options.should_merge_header),
             cols_idx_numeric,
             cols_idx_integer,
             cols_idx_decimal_specified,
@@ -696,8 +703,8 @@ impl XlsxWriter {
         &mut self,
         plan: &XlsxSinglePassPlan,
         options: &XlsxSheetWriteOptions,
-        sheet_name: &str,
-        batch: &XlsxRecordBatch,
+        sheet_name_base: &str,
+        batch: &XlsxBatchCells,
         col_names_ref: &[&str],
         row_offset: usize,
         max_data_rows: usize,
@@ -706,24 +713,19 @@ impl XlsxWriter {
         runtime_sheets: &mut Vec<XlsxSinglePassRuntimeSheet>,
         report: &mut XlsxReport,
     ) -> Result<(), String> {
-        let batch_col_names = batch
-            .schema()
-            .iter_names()
-            .map(|name| name.as_str())
-            .collect::<Vec<_>>();
-        if batch_col_names != col_names_ref {
+        if !batch.has_col_names(col_names_ref) {
             return Err("All record batches must have identical column names.".to_string());
         }
 
         let batch_start = row_offset;
-        let batch_end = row_offset + batch.len();
+        let batch_end = row_offset + batch.height();
         let mut segment_start = batch_start;
         while segment_start < batch_end {
             let row_part_start = (segment_start / max_data_rows) * max_data_rows;
             self.ensure_single_pass_runtime_sheets(
                 plan,
                 options,
-                sheet_name,
+                sheet_name_base,
                 row_part_start,
                 max_data_rows,
                 active_row_start,
@@ -733,12 +735,12 @@ impl XlsxWriter {
             )?;
 
             for runtime in runtime_sheets.iter_mut() {
-                write_arrow_record_batch_to_runtime_sheet(
+                write_batch_to_runtime_sheet(
                     &mut self.workbook,
                     &runtime.runtime,
                     batch,
                     row_offset,
-                    plan.header_grid.len(),
+                    plan.header_merge_plan.header_grid().len(),
                     plan.should_keep_missing_values,
                     &self.options_write.value_policy,
                     &options.policy_scientific,
@@ -762,7 +764,7 @@ impl XlsxWriter {
         &mut self,
         plan: &XlsxSinglePassPlan,
         options: &XlsxSheetWriteOptions,
-        sheet_name: &str,
+        sheet_name_base: &str,
         row_part_start: usize,
         max_data_rows: usize,
         active_row_start: &mut Option<usize>,
@@ -782,11 +784,10 @@ impl XlsxWriter {
         let has_multiple_col_parts = width_body > NCOLS_SHEET_MAX;
         while col_start < width_body {
             let col_end = usize::min(width_body, col_start + NCOLS_SHEET_MAX);
-            let sheet_name_base = sanitize_sheet_name(sheet_name, "_");
             let sheet_name_planned = if *next_part_idx == 1 && !has_multiple_col_parts {
-                sheet_name_base
+                sheet_name_base.to_string()
             } else {
-                create_sheet_identifier_local(&sheet_name_base, *next_part_idx)
+                create_sheet_identifier_local(sheet_name_base, *next_part_idx)
             };
             *next_part_idx += 1;
 
@@ -818,26 +819,13 @@ impl XlsxWriter {
                 fmt_decimal: &self.fmt_decimal,
                 options_write: &self.options_write,
             });
-            let data_formats_by_col = column_format_plan
-                .fmts_by_col
-                .iter()
-                .map(create_rust_xlsx_format)
-                .collect::<Vec<_>>();
-            let fmt_scientific_patch = self
-                .fmt_scientific
-                .merge(&self.options_write.base_format_patch);
-            let fmt_scientific = create_rust_xlsx_format(&fmt_scientific_patch);
-            let fmt_header = create_rust_xlsx_format(&self.fmt_header);
-            let header_grid_slice = plan
-                .header_grid
-                .iter()
-                .map(|row| row[col_start..col_end].to_vec())
-                .collect::<Vec<_>>();
+            let data_formats_by_col = create_rust_xlsx_formats(&column_format_plan.fmts_by_col);
             write_header(
                 worksheet,
-                header_grid_slice,
-                options.should_merge_header,
-                &fmt_header,
+                &plan.header_merge_plan,
+                col_start,
+                col_end,
+                &self.fmt_header,
             )?;
             worksheet
                 .set_freeze_panes(
@@ -872,11 +860,14 @@ impl XlsxWriter {
                         col_end_exclusive: col_end,
                     },
                     data_formats_by_col,
-                    fmt_scientific,
-                    numeric_cols_idx: cols_idx_numeric_slice.iter().copied().collect(),
-                    integer_cols_idx: cols_idx_integer_slice.iter().copied().collect(),
-                    decimal_cols_idx: cols_idx_decimal_slice.iter().copied().collect(),
-                    is_decimal_explicit: !cols_idx_decimal_slice.is_empty(),
+                    fmt_scientific: self.fmt_scientific.clone(),
+                    col_flags: XlsxColumnFlags::new(
+                        col_end - col_start,
+                        &cols_idx_numeric_slice,
+                        &cols_idx_integer_slice,
+                        &cols_idx_decimal_slice,
+                        &options.policy_scientific,
+                    ),
                 },
                 report_index,
             });
@@ -930,22 +921,19 @@ impl XlsxWriter {
             header_grid = extract_string_grid_from_dataframe(df_header_custom)?;
         }
 
-        let cols_idx_numeric = if self.options_write.should_infer_numeric_cols {
-            select_numeric_column_indices(body)
-        } else {
-            vec![]
-        };
-
-        let cols_idx_integer_inferred = if self.options_write.should_infer_integer_cols {
-            select_integer_column_indices(body, &cols_idx_numeric)
-        } else {
-            vec![]
-        };
+        let (cols_idx_numeric, cols_idx_integer_inferred) = select_inferred_column_indices(
+            body.get_columns().iter().map(|col| {
+                let dtype = col.dtype();
+                (dtype.is_numeric(), dtype.is_integer())
+            }),
+            &self.options_write,
+        );
 
+        let mut col_index_lookup = ColumnIndexLookup::new(&col_names);
         let cols_idx_integer_specified =
-            select_sorted_indices_from_refs(&col_names, options.cols_integer.as_deref())?;
+            col_index_lookup.select_sorted_indices(options.cols_integer.as_deref())?;
         let cols_idx_decimal_specified =
-            select_sorted_indices_from_refs(&col_names, options.cols_decimal.as_deref())?;
+            col_index_lookup.select_sorted_indices(options.cols_decimal.as_deref())?;
 
         let cols_idx_integer = if cols_idx_integer_specified.is_empty() {
             cols_idx_integer_inferred
@@ -968,6 +956,9 @@ impl XlsxWriter {
         )?;
 
         let num_frozen_rows = options.num_frozen_rows.unwrap_or(header_row_count);
+        let header_merge_plan = HeaderMergePlan::new(&header_grid, options.should_merge_header);
+        let row_bytes_body =
+            (height_body > 0 && width_body > 0).then(|| body.estimated_size() / height_body);
 
         for _sheet_slice in sheet_slices {
             let sheet_slice = _sheet_slice;
@@ -1008,49 +999,31 @@ impl XlsxWriter {
                 options_write: &self.options_write,
             });
 
-            let data_formats_by_col: Vec<Format> = column_format_plan
-                .fmts_by_col
-                .iter()
-                .map(create_rust_xlsx_format)
-                .collect();
-            let fmt_scientific_patch = self
-                .fmt_scientific
-                .merge(&self.options_write.base_format_patch);
-            let fmt_scientific = create_rust_xlsx_format(&fmt_scientific_patch);
-            let fmt_header = create_rust_xlsx_format(&self.fmt_header);
-
-            let header_grid_slice = header_grid
-                .iter()
-                .map(|row| {
-                    row[sheet_slice.col_start_inclusive..sheet_slice.col_end_exclusive].to_vec()
-                })
-                .collect::<Vec<_>>();
-
+            let data_formats_by_col = create_rust_xlsx_formats(&column_format_plan.fmts_by_col);
             let mut header_widths_by_col = vec![0usize; data_formats_by_col.len()];
             let mut body_widths_by_col = vec![0usize; data_formats_by_col.len()];
 
             let should_autofit_columns = !matches!(options.policy_autofit.mode, AutofitMode::None);
+            let should_scan_body_width = matches!(
+                options.policy_autofit.mode,
+                AutofitMode::Body | AutofitMode::All
+            );
+            let width_body_saturated = calculate_autofit_width_saturated(&options.policy_autofit);
+            let width_missing =
+                calculate_missing_cell_width(should_keep_missing_values, &value_policy);
 
             if should_autofit_columns && !data_formats_by_col.is_empty() {
                 for _col_idx in 0..data_formats_by_col.len() {
                     let col_idx = _col_idx;
-                    for _row in &header_grid_slice {
+                    for _row in &header_grid {
                         let row = _row;
-                        let value = &row[col_idx];
+                        let value = &row[sheet_slice.col_start_inclusive + col_idx];
                         if value.is_empty() {
                             continue;
                         }
                         header_widths_by_col[col_idx] = usize::max(
                             header_widths_by_col[col_idx],
-                            estimate_width_len(
-                                &CellValue::String(value.clone()),
-                                false,
-                                false,
-                                false,
-                                &options.policy_scientific,
-                                should_keep_missing_values,
-                                &value_policy,
-                            ),
+                            estimate_unicode_string_width(value),
                         );
                     }
                 }
@@ -1058,9 +1031,10 @@ impl XlsxWriter {
 
             write_header(
                 worksheet,
-                header_grid_slice,
-                options.should_merge_header,
-                &fmt_header,
+                &header_merge_plan,
+                sheet_slice.col_start_inclusive,
+                sheet_slice.col_end_exclusive,
+                &self.fmt_header,
             )?;
 
             worksheet
@@ -1070,13 +1044,24 @@ impl XlsxWriter {
                 )
                 .map_err(format_xlsx_error_text)?;
 
-            let numeric_cols_idx: BTreeSet<usize> =
-                cols_idx_numeric_slice.iter().copied().collect();
-            let integer_cols_idx: BTreeSet<usize> =
-                cols_idx_integer_slice.iter().copied().collect();
-            let decimal_cols_idx: BTreeSet<usize> =
-                cols_idx_decimal_slice.iter().copied().collect();
-            let is_decimal_explicit = !decimal_cols_idx.is_empty();
+            let XlsxColumnFlags {
+                is_numeric_by_col,
+                is_integer_by_col,
+                is_scientific_candidate_by_col,
+            } = XlsxColumnFlags::new(
+                data_formats_by_col.len(),
+                &cols_idx_numeric_slice,
+                &cols_idx_integer_slice,
+                &cols_idx_decimal_slice,
+                &options.policy_scientific,
+            );
+            let cell_formats_by_col = create_column_cell_formats(
+                &data_formats_by_col,
+                &self.fmt_scientific,
+                &is_numeric_by_col,
+                &is_scientific_candidate_by_col,
+                &options.policy_scientific,
+            );
 
             let mut cols_slice = Vec::with_capacity(data_formats_by_col.len());
             let rows_data_in_sheet =
@@ -1088,123 +1073,81 @@ impl XlsxWriter {
                         .slice(sheet_slice.row_start_inclusive as i64, rows_data_in_sheet),
                 );
             }
-            let rows_chunk = calculate_row_chunk_size(
+            let rows_chunk = calculate_row_chunk_size_with_row_bytes(
                 data_formats_by_col.len(),
+                row_bytes_body.map(|val| val * data_formats_by_col.len() / width_body),
                 &self.options_write.row_chunk_policy,
             );
             if rows_chunk == 0 {
                 return Err("row_chunk_policy resolved to 0 rows; expected >= 1.".to_string());
             }
-            let row_chunks = generate_row_chunks(rows_data_in_sheet, rows_chunk);
+            let row_chunks = iter_row_chunks(rows_data_in_sheet, rows_chunk);
 
-            let mut rows_seen_for_autofit = 0usize;
+            let mut rows_autofit_remaining = options
+                .policy_autofit
+                .height_body_inferred_max
+                .unwrap_or(usize::MAX);
             for _row_chunk in row_chunks {
                 let (row_chunk_start, row_chunk_len) = _row_chunk;
                 let row_chunk_end = row_chunk_start + row_chunk_len;
-                for _row_local in row_chunk_start..row_chunk_end {
-                    let row_local = _row_local;
-                    for _col in cols_slice.iter().enumerate() {
-                        let (col_idx, col) = _col;
-                        let is_numeric_col = numeric_cols_idx.contains(&col_idx);
-                        let is_integer_col = integer_cols_idx.contains(&col_idx);
-                        let is_decimal_specified = decimal_cols_idx.contains(&col_idx);
-                        let is_scientific_candidate = is_scientific_candidate_col(
-                            &options.policy_scientific,
-                            is_integer_col,
-                            is_decimal_explicit,
-                            is_decimal_specified,
-                        );
 
-                        let value_raw = convert_any_value_to_cell_value(
-                            col.get(row_local)
-                                .map_err(|err| format!("Failed to access cell value: {err}"))?,
-                        );
-                        let value = convert_cell_value(
-                            &value_raw,
-                            is_numeric_col,
-                            is_integer_col,
+                // Convert each column once per chunk, then emit cells row-major as
+                // constant-memory worksheets require.
+                let values_by_col = cols_slice
+                    .iter()
+                    .enumerate()
+                    .map(|(col_idx, col)| {
+                        let values_raw =
+                            extract_column_cell_values(col, row_chunk_start, row_chunk_end)?;
+                        Ok(normalize_cell_values(
+                            values_raw,
+                            is_numeric_by_col[col_idx],
+                            is_integer_by_col[col_idx],
                             should_keep_missing_values,
                             &value_policy,
-                        );
-
-                        if should_autofit_columns
-                            && (options.policy_autofit.height_body_inferred_max.is_none()
-                                || rows_seen_for_autofit
-                                    < options.policy_autofit.height_body_inferred_max.unwrap_or(0))
-                        {
-                            body_widths_by_col[col_idx] = usize::max(
-                                body_widths_by_col[col_idx],
-                                estimate_width_len(
-                                    &value,
-                                    is_numeric_col,
-                                    is_integer_col,
-                                    is_scientific_candidate,
-                                    &options.policy_scientific,
-                                    should_keep_missing_values,
-                                    &value_policy,
-                                ),
-                            );
-                        }
-
-                        let should_use_scientific = should_use_scientific_value(
-                            &value,
-                            is_numeric_col,
-                            is_scientific_candidate,
+                        ))
+                    })
+                    .collect::<Result<Vec<_>, String>>()?;
+
+                if should_scan_body_width && rows_autofit_remaining > 0 {
+                    let rows_to_scan = usize::min(rows_autofit_remaining, row_chunk_len);
+                    for (col_idx, values) in values_by_col.iter().enumerate() {
+                        body_widths_by_col[col_idx] = calculate_body_column_width(
+                            &values[..rows_to_scan],
+                            body_widths_by_col[col_idx],
+                            width_body_saturated,
+                            is_numeric_by_col[col_idx],
+                            is_integer_by_col[col_idx],
+                            is_scientific_candidate_by_col[col_idx],
                             &options.policy_scientific,
+                            width_missing,
                         );
-                        let fmt_cell = if should_use_scientific {
-                            &fmt_scientific
-                        } else {
-                            &data_formats_by_col[col_idx]
-                        };
-
-                        write_cell_with_format(
-                            worksheet,
-                            header_row_count + row_local,
-                            col_idx,
-                            &value,
-                            fmt_cell,
-                        )?;
                     }
-
-                    if should_autofit_columns
-                        && (options.policy_autofit.height_body_inferred_max.is_none()
-                            || rows_seen_for_autofit
-                                < options.policy_autofit.height_body_inferred_max.unwrap_or(0))
+                    rows_autofit_remaining -= rows_to_scan;
+                    // Once every column is saturated no later row can change a width.
+                    if body_widths_by_col
+                        .iter()
+                        .all(|width| *width >= width_body_saturated)
                     {
-                        rows_seen_for_autofit += 1;
+                        rows_autofit_remaining = 0;
                     }
                 }
-            }
-
-            if should_autofit_columns && !data_formats_by_col.is_empty() {
-                let width_min = usize::max(1, options.policy_autofit.width_cell_min);
-                let width_max = usize::min(
-                    255,
-                    usize::max(width_min, options.policy_autofit.width_cell_max),
-                );
-                let width_padding = options.policy_autofit.width_cell_padding;
 
-                for _col_idx in 0..data_formats_by_col.len() {
-                    let col_idx = _col_idx;
-                    let width_recorded = match options.policy_autofit.mode {
-                        AutofitMode::Header => header_widths_by_col[col_idx],
-                        AutofitMode::Body => body_widths_by_col[col_idx],
-                        AutofitMode::All => {
-                            usize::max(header_widths_by_col[col_idx], body_widths_by_col[col_idx])
-                        }
-                        AutofitMode::None => header_widths_by_col[col_idx],
-                    };
-                    let width_final = usize::min(
-                        width_max,
-                        usize::max(width_min, width_recorded + width_padding),
-                    );
-                    worksheet
-                        .set_column_width(cast_col_num(col_idx)?, width_final as f64)
-                        .map_err(format_xlsx_error_text)?;
-                }
+                write_cells_row_major(
+                    worksheet,
+                    header_row_count + row_chunk_start,
+                    &values_by_col,
+                    &cell_formats_by_col,
+                )?;
             }
 
+            apply_column_widths(
+                worksheet,
+                &options.policy_autofit,
+                &header_widths_by_col,
+                &body_widths_by_col,
+            )?;
+
             report.sheets.push(SheetSlice {
                 sheet_name: sheet_name_unique,
                 row_start_inclusive: sheet_slice.row_start_inclusive,
@@ -1267,42 +1210,49 @@ impl<'a> XlsxSheetPlanBuilder<'a> {
             cols_idx_numeric: vec![],
             cols_idx_integer: vec![],
             cols_idx_decimal_specified: vec![],
+            col_flags: XlsxColumnFlags::default(),
             header_widths_by_col: vec![],
             body_widths_by_col: vec![],
-            rows_seen_for_autofit: 0,
+            rows_autofit_remaining: options
+                .policy_autofit
+                .height_body_inferred_max
+                .unwrap_or(usize::MAX),
             should_keep_missing_values,
         }
     }
 
     fn scan_batch(&mut self, batch: XlsxRecordBatch) -> Result<(), String> {
-        let df_batch = dataframe_from_record_batch(batch)?;
-        self.ensure_initialized(&df_batch)?;
+        self.ensure_initialized(batch.schema())?;
 
         let should_scan_body_width = matches!(
             self.options.policy_autofit.mode,
             AutofitMode::Body | AutofitMode::All
         );
-        if should_scan_body_width && df_batch.width() > 0 {
-            self.scan_body_widths(&df_batch)?;
+        let batch = XlsxBatchCells::from_record_batch(batch)?;
+        if should_scan_body_width && self.width_body > 0 {
+            self.scan_body_widths(&batch)?;
         }
-        self.height_body += df_batch.height();
+        self.height_body += batch.height();
         Ok(())
     }
 
-    fn ensure_initialized(&mut self, df_batch: &DataFrame) -> Result<(), String> {
-        let batch_col_names = df_batch
-            .get_column_names_str()
-            .iter()
-            .map(|val| (*val).to_string())
-            .collect::<Vec<_>>();
-
+    fn ensure_initialized(&mut self, schema: &ArrowSchema) -> Result<(), String> {
         if let Some(col_names) = &self.col_names {
-            if col_names != &batch_col_names {
+            if !col_names
+                .iter()
+                .map(String::as_str)
+                .eq(schema.iter_names().map(|name| name.as_str()))
+            {
                 return Err("All record batches must have identical column names.".to_string());
             }
             return Ok(());
         }
 
+        let batch_col_names = schema
+            .iter_names()
+            .map(|name| name.to_string())
+            .collect::<Vec<_>>();
+
         let col_names_ref = batch_col_names
             .iter()
             .map(String::as_str)
@@ -1325,25 +1275,25 @@ impl<'a> XlsxSheetPlanBuilder<'a> {
             None => vec![batch_col_names.clone()],
         };
 
-        self.cols_idx_numeric = if self.options_write.should_infer_numeric_cols {
-            select_numeric_column_indices(df_batch)
-        } else {
-            vec![]
-        };
-
-        let cols_idx_integer_inferred = if self.options_write.should_infer_integer_cols {
-            select_integer_column_indices(df_batch, &self.cols_idx_numeric)
-        } else {
-            vec![]
-        };
+        let (cols_idx_numeric, cols_idx_integer_inferred) = select_inferred_column_indices(
+            schema
+                .iter_values()
+                .map(|field| classify_arrow_dtype(field.dtype())),
+            &self.options_write,
+        );
+        self.cols_idx_numeric = cols_idx_numeric;
 
+        let mut col_index_lookup = ColumnIndexLookup::new(&col_names_ref);
         let cols_idx_integer_specified =
-            select_sorted_indices_from_refs(&col_names_ref, self.options.cols_integer.as_deref())?;
+            col_index_lookup.select_sorted_indices(self.options.cols_integer.as_deref())?;
         self.cols_idx_decimal_specified =
-            select_sorted_indices_from_refs(&col_names_ref, self.options.cols_decimal.as_deref())?;
+            col_index_lookup.select_sorted_indices(self.options.cols_decimal.as_deref())?;
 
-        let rows_chunk =
-            calculate_row_chunk_size(self.width_body, &self.options_write.row_chunk_policy);
+        let rows_chunk = calculate_row_chunk_size_with_row_bytes(
+            self.width_body,
+            Some(estimate_arrow_row_bytes(schema)),
+            &self.options_write.row_chunk_policy,
+        );
         if rows_chunk == 0 {
             return Err("row_chunk_policy resolved to 0 rows; expected >= 1.".to_string());
         }
@@ -1353,6 +1303,13 @@ impl<'a> XlsxSheetPlanBuilder<'a> {
         } else {
             cols_idx_integer_specified
         };
+        self.col_flags = XlsxColumnFlags::new(
+            self.width_body,
+            &self.cols_idx_numeric,
+            &self.cols_idx_integer,
+            &self.cols_idx_decimal_specified,
+            &self.options.policy_scientific,
+        );
 
         self.header_widths_by_col = vec![0usize; self.width_body];
         self.body_widths_by_col = vec![0usize; self.width_body];
@@ -1365,15 +1322,7 @@ impl<'a> XlsxSheetPlanBuilder<'a> {
                     }
                     self.header_widths_by_col[col_idx] = usize::max(
                         self.header_widths_by_col[col_idx],
-                        estimate_width_len(
-                            &CellValue::String(value.clone()),
-                            false,
-                            false,
-                            false,
-                            &self.options.policy_scientific,
-                            self.should_keep_missing_values,
-                            &self.value_policy,
-                        ),
+                        estimate_unicode_string_width(value),
                     );
                 }
             }
@@ -1384,65 +1333,59 @@ impl<'a> XlsxSheetPlanBuilder<'a> {
         Ok(())
     }
 
-    fn scan_body_widths(&mut self, df_batch: &DataFrame) -> Result<(), String> {
-        let Some(max_rows) = self.options.policy_autofit.height_body_inferred_max else {
-            return self.scan_body_width_rows(df_batch, df_batch.height());
-        };
-        if self.rows_seen_for_autofit >= max_rows {
+    fn scan_body_widths(&mut self, batch: &XlsxBatchCells) -> Result<(), String> {
+        if self.rows_autofit_remaining == 0 {
             return Ok(());
         }
-        let remaining = max_rows - self.rows_seen_for_autofit;
-        let rows_to_scan = usize::min(remaining, df_batch.height());
-        self.scan_body_width_rows(df_batch, rows_to_scan)
+        let rows_to_scan = usize::min(self.rows_autofit_remaining, batch.height());
+        self.scan_body_width_rows(batch, rows_to_scan)
     }
 
     fn scan_body_width_rows(
         &mut self,
-        df_batch: &DataFrame,
+        batch: &XlsxBatchCells,
         rows_to_scan: usize,
     ) -> Result<(), String> {
-        let numeric_cols_idx: BTreeSet<usize> = self.cols_idx_numeric.iter().copied().collect();
-        let integer_cols_idx: BTreeSet<usize> = self.cols_idx_integer.iter().copied().collect();
-        let decimal_cols_idx: BTreeSet<usize> =
-            self.cols_idx_decimal_specified.iter().copied().collect();
-        let is_decimal_explicit = !decimal_cols_idx.is_empty();
-
-        for row_local in 0..rows_to_scan {
-            for (col_idx, col) in df_batch.get_columns().iter().enumerate() {
-                let is_numeric_col = numeric_cols_idx.contains(&col_idx);
-                let is_integer_col = integer_cols_idx.contains(&col_idx);
-                let is_decimal_specified = decimal_cols_idx.contains(&col_idx);
-                let is_scientific_candidate = is_scientific_candidate_col(
-                    &self.options.policy_scientific,
-                    is_integer_col,
-                    is_decimal_explicit,
-                    is_decimal_specified,
-                );
-                let value_raw = convert_any_value_to_cell_value(
-                    col.get(row_local)
-                        .map_err(|err| format!("Failed to access cell value: {err}"))?,
-                );
-                let value = convert_cell_value(
-                    &value_raw,
-                    is_numeric_col,
-                    is_integer_col,
-                    self.should_keep_missing_values,
-                    &self.value_policy,
-                );
-                self.body_widths_by_col[col_idx] = usize::max(
-                    self.body_widths_by_col[col_idx],
-                    estimate_width_len(
-                        &value,
-                        is_numeric_col,
-                        is_integer_col,
-                        is_scientific_candidate,
-                        &self.options.policy_scientific,
-                        self.should_keep_missing_values,
-                        &self.value_policy,
-                    ),
-                );
+        let width_body_saturated = calculate_autofit_width_saturated(&self.options.policy_autofit);
+        let width_missing =
+            calculate_missing_cell_width(self.should_keep_missing_values, &self.value_policy);
+        for col_idx in 0..self.width_body {
+            // Wider values cannot change a column already at the max width.
+            if self.body_widths_by_col[col_idx] >= width_body_saturated {
+                continue;
             }
-            self.rows_seen_for_autofit += 1;
+            let is_numeric_col = self.col_flags.is_numeric_by_col[col_idx];
+            let is_integer_col = self.col_flags.is_integer_by_col[col_idx];
+            let is_scientific_candidate = self.col_flags.is_scientific_candidate_by_col[col_idx];
+            let values = convert_batch_column_to_cell_values(
+                batch,
+                col_idx,
+                0,
+                rows_to_scan,
+                is_numeric_col,
+                is_integer_col,
+                self.should_keep_missing_values,
+                &self.value_policy,
+            )?;
+            self.body_widths_by_col[col_idx] = calculate_body_column_width(
+                &values,
+                self.body_widths_by_col[col_idx],
+                width_body_saturated,
+                is_numeric_col,
+                is_integer_col,
+                is_scientific_candidate,
+                &self.options.policy_scientific,
+                width_missing,
+            );
+        }
+        self.rows_autofit_remaining -= rows_to_scan;
+        // Once every column is saturated no later batch can change a width.
+        if self
+            .body_widths_by_col
+            .iter()
+            .all(|width| *width >= width_body_saturated)
+        {
+            self.rows_autofit_remaining = 0;
         }
         Ok(())
     }
@@ -1483,6 +1426,71 @@ impl<'a> XlsxSheetPlanBuilder<'a> {
     }
 }
 
+impl XlsxColumnFlags {
+    fn new(
+        width: usize,
+        cols_idx_numeric: &[usize],
+        cols_idx_integer: &[usize],
+        cols_idx_decimal: &[usize],
+        policy_scientific: &ScientificPolicy,
+    ) -> Self {
+        let is_numeric_by_col = create_column_mask(width, cols_idx_numeric);
+        let is_integer_by_col = create_column_mask(width, cols_idx_integer);
+        let is_decimal_by_col = create_column_mask(width, cols_idx_decimal);
+        let is_decimal_explicit = !cols_idx_decimal.is_empty();
+        let is_scientific_candidate_by_col = (0..width)
+            .map(|col_idx| {
+                is_scientific_candidate_col(
+                    policy_scientific,
+                    is_integer_by_col[col_idx],
+                    is_decimal_explicit,
+                    is_decimal_by_col[col_idx],
+                )
+            })
+            .collect();
+        Self {
+            is_numeric_by_col,
+            is_integer_by_col,
+            is_scientific_candidate_by_col,
+        }
+    }
+}
+
+impl XlsxBatchCells {
+    /// Read Arrow buffers directly unless a column needs Polars logical-type rendering.
+    ///
+    /// Empty batches never read a cell, so they skip the DataFrame conversion outright.
+    fn from_record_batch(batch: XlsxRecordBatch) -> Result<Self, String> {
+        if batch.len() == 0
+            || batch
+                .schema()
+                .iter_values()
+                .all(|field| is_arrow_cell_dtype_native(field.dtype()))
+        {
+            return Ok(Self::Arrow(batch));
+        }
+        Ok(Self::DataFrame(dataframe_from_record_batch(batch)?))
+    }
+
+    fn height(&self) -> usize {
+        match self {
+            Self::Arrow(batch) => batch.len(),
+            Self::DataFrame(df) => df.height(),
+        }
+    }
+
+    fn has_col_names(&self, col_names_ref: &[&str]) -> bool {
+        match self {
+            Self::Arrow(batch) => batch
+                .schema()
+                .iter_names()
+                .map(|name| name.as_str())
+                .eq(col_names_ref.iter().copied()),
+            Self::DataFrame(df) => df.get_column_names_str() == col_names_ref,
+        }
+    }
+}
+
 fn dataframe_from_record_batch(batch: XlsxRecordBatch) -> Result<DataFrame, String> {
     let schema_arrow = batch.schema().clone();
     let mut df = DataFrame::empty_with_arrow_schema(&schema_arrow);
@@ -1505,31 +1513,44 @@ fn apply_column_widths(
     let width_max = usize::min(255, usize::max(width_min, policy_autofit.width_cell_max));
     let width_padding = policy_autofit.width_cell_padding;
 
-    for col_idx in 0..header_widths_by_col.len() {
-        let width_recorded = match policy_autofit.mode {
-            AutofitMode::Header => header_widths_by_col[col_idx],
-            AutofitMode::Body => body_widths_by_col[col_idx],
-            AutofitMode::All => {
-                usize::max(header_widths_by_col[col_idx], body_widths_by_col[col_idx])
-            }
-            AutofitMode::None => header_widths_by_col[col_idx],
-        };
-        let width_final = usize::min(
-            width_max,
-            usize::max(width_min, width_recorded + width_padding),
-        );
+    let widths_final = (0..header_widths_by_col.len())
+        .map(|col_idx| {
+            let width_recorded = match policy_autofit.mode {
+                AutofitMode::Header => header_widths_by_col[col_idx],
+                AutofitMode::Body => body_widths_by_col[col_idx],
+                AutofitMode::All => {
+                    usize::max(header_widths_by_col[col_idx], body_widths_by_col[col_idx])
+                }
+                AutofitMode::None => header_widths_by_col[col_idx],
+            };
+            usize::min(
+                width_max,
+                usize::max(width_min, width_recorded + width_padding),
+            )
+        })
+        .collect::<Vec<_>>();
+
+    // Adjacent columns sharing a width are set as one range.
+    let mut col_idx_start = 0usize;
+    for _run in widths_final.chunk_by(|lhs, rhs| lhs == rhs) {
+        let col_idx_end = col_idx_start + _run.len() - 1;
         worksheet
-            .set_column_width(cast_col_num(col_idx)?, width_final as f64)
+            .set_column_range_width(
+                cast_col_num(col_idx_start)?,
+                cast_col_num(col_idx_end)?,
+                _run[0] as f64,
+            )
             .map_err(format_xlsx_error_text)?;
+        col_idx_start = col_idx_end + 1;
     }
     Ok(())
 }
 
 #[allow(clippy::too_many_arguments)]
-fn write_record_batch_to_runtime_sheet(
+fn write_batch_to_runtime_sheet(
     workbook: &mut Workbook,
     runtime: &XlsxSheetRuntime,
-    df_batch: &DataFrame,
+    batch: &XlsxBatchCells,
     row_offset: usize,
     header_row_count: usize,
     should_keep_missing_values: bool,
@@ -1537,7 +1558,7 @@ fn write_record_batch_to_runtime_sheet(
     policy_scientific: &ScientificPolicy,
 ) -> Result<(), String> {
     let batch_start = row_offset;
-    let batch_end = row_offset + df_batch.height();
+    let batch_end = row_offset + batch.height();
     let sheet_start = runtime.sheet_slice.row_start_inclusive;
     let sheet_end = runtime.sheet_slice.row_end_exclusive;
     let overlap_start = usize::max(batch_start, sheet_start);
@@ -1550,130 +1571,116 @@ fn write_record_batch_to_runtime_sheet(
         .worksheet_from_index(runtime.worksheet_index)
         .map_err(format_xlsx_error_text)?;
 
-    for row_abs in overlap_start..overlap_end {
-        let row_local_in_batch = row_abs - batch_start;
-        let row_local_in_sheet = row_abs - sheet_start;
-        for col_abs in
-            runtime.sheet_slice.col_start_inclusive..runtime.sheet_slice.col_end_exclusive
-        {
-            let col_idx = col_abs - runtime.sheet_slice.col_start_inclusive;
-            let col = &df_batch.get_columns()[col_abs];
-            let is_numeric_col = runtime.numeric_cols_idx.contains(&col_idx);
-            let is_integer_col = runtime.integer_cols_idx.contains(&col_idx);
-            let is_decimal_specified = runtime.decimal_cols_idx.contains(&col_idx);
-            let is_scientific_candidate = is_scientific_candidate_col(
-                policy_scientific,
-                is_integer_col,
-                runtime.is_decimal_explicit,
-                is_decimal_specified,
-            );
-            let value_raw = convert_any_value_to_cell_value(
-                col.get(row_local_in_batch)
-                    .map_err(|err| format!("Failed to access cell value: {err}"))?,
-            );
-            let value = convert_cell_value(
-                &value_raw,
-                is_numeric_col,
-                is_integer_col,
+    // Convert column-at-a-time so each column is downcast once per batch,
+    // then emit cells row-major as required by constant-memory worksheets.
+    let row_start_in_batch = overlap_start - batch_start;
+    let row_end_in_batch = overlap_end - batch_start;
+    let XlsxColumnFlags {
+        is_numeric_by_col,
+        is_integer_by_col,
+        is_scientific_candidate_by_col,
+    } = &runtime.col_flags;
+    let values_by_col = (runtime.sheet_slice.col_start_inclusive
+        ..runtime.sheet_slice.col_end_exclusive)
+        .enumerate()
+        .map(|(col_idx, col_abs)| {
+            convert_batch_column_to_cell_values(
+                batch,
+                col_abs,
+                row_start_in_batch,
+                row_end_in_batch,
+                is_numeric_by_col[col_idx],
+                is_integer_by_col[col_idx],
                 should_keep_missing_values,
                 value_policy,
-            );
-            let should_use_scientific = should_use_scientific_value(
-                &value,
-                is_numeric_col,
-                is_scientific_candidate,
-                policy_scientific,
-            );
-            let fmt_cell = if should_use_scientific {
-                &runtime.fmt_scientific
-            } else {
-                &runtime.data_formats_by_col[col_idx]
-            };
-            write_cell_with_format(
-                worksheet,
-                header_row_count + row_local_in_sheet,
-                col_idx,
-                &value,
-                fmt_cell,
-            )?;
-        }
-    }
-
-    Ok(())
+            )
+        })
+        .collect::<Result<Vec<_>, _>>()?;
+
+    let cell_formats_by_col = create_column_cell_formats(
+        &runtime.data_formats_by_col,
+        &runtime.fmt_scientific,
+        is_numeric_by_col,
+        is_scientific_candidate_by_col,
+        policy_scientific,
+    );
+    write_cells_row_major(
+        worksheet,
+        header_row_count + overlap_start - sheet_start,
+        &values_by_col,
+        &cell_formats_by_col,
+    )
 }
 
-#[allow(clippy::too_many_arguments)]
-fn write_arrow_record_batch_to_runtime_sheet(
-    workbook: &mut Workbook,
-    runtime: &XlsxSheetRuntime,
-    batch: &XlsxRecordBatch,
-    row_offset: usize,
-    header_row_count: usize,
+/// Width of a missing cell: the missing-value text when kept, else blank.
+///
+/// Resolved once per autofit scan and passed to [`estimate_width_len`].
+fn calculate_missing_cell_width(
     should_keep_missing_values: bool,
     value_policy: &XlsxValuePolicy,
-    policy_scientific: &ScientificPolicy,
-) -> Result<(), String> {
-    let batch_start = row_offset;
-    let batch_end = row_offset + batch.len();
-    let sheet_start = runtime.sheet_slice.row_start_inclusive;
-    let sheet_end = runtime.sheet_slice.row_end_exclusive;
-    let overlap_start = usize::max(batch_start, sheet_start);
-    let overlap_end = usize::min(batch_end, sheet_end);
-    if overlap_start >= overlap_end {
-        return Ok(());
+) -> usize {
+    if should_keep_missing_values {
+        value_policy.missing_value_str.len()
+    } else {
+        0
     }
+}
 
-    let worksheet = workbook
-        .worksheet_from_index(runtime.worksheet_index)
-        .map_err(format_xlsx_error_text)?;
-
-    for row_abs in overlap_start..overlap_end {
-        let row_local_in_batch = row_abs - batch_start;
-        let row_local_in_sheet = row_abs - sheet_start;
-        for col_abs in
-            runtime.sheet_slice.col_start_inclusive..runtime.sheet_slice.col_end_exclusive
-        {
-            let col_idx = col_abs - runtime.sheet_slice.col_start_inclusive;
-            let col = &batch.arrays()[col_abs];
-            let is_numeric_col = runtime.numeric_cols_idx.contains(&col_idx);
-            let is_integer_col = runtime.integer_cols_idx.contains(&col_idx);
-            let is_decimal_specified = runtime.decimal_cols_idx.contains(&col_idx);
-            let is_scientific_candidate = is_scientific_candidate_col(
-                policy_scientific,
-                is_integer_col,
-                runtime.is_decimal_explicit,
-                is_decimal_specified,
-            );
-            let value_raw = convert_arrow_value_to_cell_value(col.as_ref(), row_local_in_batch)?;
-            let value = convert_cell_value(
-                &value_raw,
-                is_numeric_col,
-                is_integer_col,
-                should_keep_missing_values,
-                value_policy,
-            );
-            let should_use_scientific = should_use_scientific_value(
-                &value,
-                is_numeric_col,
-                is_scientific_candidate,
-                policy_scientific,
-            );
-            let fmt_cell = if should_use_scientific {
-                &runtime.fmt_scientific
-            } else {
-                &runtime.data_formats_by_col[col_idx]
-            };
-            write_cell_with_format(
-                worksheet,
-                header_row_count + row_local_in_sheet,
-                col_idx,
-                &value,
-                fmt_cell,
-            )?;
+/// Widen `width_start` to the widest of `values`, stopping once saturated.
+///
+/// Numbers in non-scientific numeric columns render with a fixed pattern whose
+/// length only grows with magnitude, so just the column's extreme numbers are
+/// formatted instead of every cell.
+#[allow(clippy::too_many_arguments)]
+fn calculate_body_column_width(
+    values: &[CellValue],
+    width_start: usize,
+    width_saturated: usize,
+    is_numeric_col: bool,
+    is_integer_col: bool,
+    is_scientific_candidate: bool,
+    policy_scientific: &ScientificPolicy,
+    width_missing: usize,
+) -> usize {
+    let estimate = |value: &CellValue| {
+        estimate_width_len(
+            value,
+            is_numeric_col,
+            is_integer_col,
+            is_scientific_candidate,
+            policy_scientific,
+            width_missing,
+        )
+    };
+    let should_use_number_range = is_numeric_col && !is_scientific_candidate;
+    let mut number_range: Option<(f64, f64)> = None;
+    let mut width = width_start;
+    for value in values {
+        if width >= width_saturated {
+            return width;
+        }
+        match value {
+            // `total_cmp` keeps `-0.0` below `0.0`, so its sign is not lost.
+            CellValue::Number(n) if should_use_number_range => {
+                let (n_min, n_max) = number_range.get_or_insert((*n, *n));
+                if n.total_cmp(n_min).is_lt() {
+                    *n_min = *n;
+                }
+                if n.total_cmp(n_max).is_gt() {
+                    *n_max = *n;
+                }
+            }
+            // A string never measures wider than its byte length, so strings that
+            // cannot widen the column are not measured at all.
+            CellValue::String(s) if s.len() <= width => {}
+            _ => width = usize::max(width, estimate(value)),
         }
     }
-
-    Ok(())
+    if let Some((n_min, n_max)) = number_range {
+        width = usize::max(width, estimate(&CellValue::Number(n_min)));
+        width = usize::max(width, estimate(&CellValue::Number(n_max)));
+    }
+    width
 }
 
 /// Estimate displayed width units for one normalized cell value.
@@ -1685,17 +1692,10 @@ fn estimate_width_len(
     is_integer_col: bool,
     is_scientific_candidate: bool,
     policy_scientific: &ScientificPolicy,
-    should_keep_missing_values: bool,
-    value_policy: &XlsxValuePolicy,
+    width_missing: usize,
 ) -> usize {
     match value {
-        CellValue::None => {
-            if should_keep_missing_values {
-                value_policy.missing_value_str.len()
-            } else {
-                0
-            }
-        }
+        CellValue::None => width_missing,
         CellValue::String(s) => {
             if s.is_empty() {
                 return 0;
@@ -1704,38 +1704,74 @@ fn estimate_width_len(
                 return estimate_unicode_string_width(s);
             }
             if is_integer_col && let Ok(val) = s.parse::<i64>() {
-                return val.to_string().len();
+                return measure_formatted_len(format_args!("{val}"));
             }
             estimate_unicode_string_width(s)
         }
         CellValue::Number(n) => {
             if !is_numeric_col {
-                return estimate_unicode_string_width(&n.to_string());
+                // Number text is always ASCII, so its width is its byte length.
+                return measure_formatted_len(format_args!("{n}"));
             }
-            if should_use_scientific_value(
-                value,
-                is_numeric_col,
-                is_scientific_candidate,
-                policy_scientific,
-            ) {
-                return format!("{n:.2E}").len();
+            if is_scientific_candidate
+                && is_scientific_number(*n, policy_scientific.thr_min, policy_scientific.thr_max)
+            {
+                return measure_formatted_len(format_args!("{n:.2E}"));
             }
             if is_integer_col {
-                return (*n as i64).to_string().len();
+                return measure_formatted_len(format_args!("{}", *n as i64));
             }
-            format!("{n:.4}").len()
+            measure_formatted_len(format_args!("{n:.4}"))
         }
     }
 }
 
+/// `fmt::Write` sink that only counts bytes.
+#[derive(Debug, Default)]
+struct FormattedLenCounter(usize);
+
+impl std::fmt::Write for FormattedLenCounter {
+    fn write_str(&mut self, s: &str) -> std::fmt::Result {
+        self.0 += s.len();
+        Ok(())
+    }
+}
+
+/// Byte length of formatted output, measured without allocating a `String`.
+fn measure_formatted_len(args: std::fmt::Arguments<'_>) -> usize {
+    let mut counter = FormattedLenCounter::default();
+    let _ = std::fmt::Write::write_fmt(&mut counter, args);
+    counter.0
+}
+
+/// Estimate display width: ASCII chars count 1, other chars 1.6 (rounded).
+///
+/// All-ASCII text, the common case, is measured by byte length without decoding.
 fn estimate_unicode_string_width(s: &str) -> usize {
-    let ascii_count = s.chars().filter(|chr| chr.is_ascii()).count();
-    let non_ascii_count = s.chars().count().saturating_sub(ascii_count);
+    if s.is_ascii() {
+        return s.len();
+    }
+    // ASCII chars are exactly the ASCII bytes in UTF-8, and `chars().count()` only
+    // counts leading bytes, so neither count decodes the string.
+    let ascii_count = s.bytes().filter(u8::is_ascii).count();
+    let non_ascii_count = s.chars().count() - ascii_count;
     ascii_count + (non_ascii_count as f64 * 1.6).round() as usize
 }
 
-/// Build per-column base/final format plans for current sheet slice.
-fn plan_column_formats(options: ColumnFormatPlanOptions<'_>) -> ColumnFormatPlan {
+/// Overlay the writer base patch, borrowing `fmt` unchanged when the base patch is empty.
+fn merge_base_format_patch<'a>(
+    fmt: &'a CellFormatPatch,
+    base_patch: &CellFormatPatch,
+) -> Cow<'a, CellFormatPatch> {
+    if base_patch.is_empty() {
+        Cow::Borrowed(fmt)
+    } else {
+        Cow::Owned(fmt.merge(base_patch))
+    }
+}
+
+/// Build per-column base/final format plans for current sheet slice.
+fn plan_column_formats(options: ColumnFormatPlanOptions<'_>) -> ColumnFormatPlan {
     let ColumnFormatPlanOptions {
         width_data,
         cols_idx_numeric,
@@ -1748,37 +1784,46 @@ fn plan_column_formats(options: ColumnFormatPlanOptions<'_>) -> ColumnFormatPlan
         options_write,
     } = options;
 
-    let numeric_cols_idx: BTreeSet<usize> = cols_idx_numeric.iter().copied().collect();
-    let integer_cols_idx: BTreeSet<usize> = cols_idx_integer.iter().copied().collect();
-    let decimal_cols_idx: Option<BTreeSet<usize>> =
-        cols_idx_decimal.map(|vals| vals.iter().copied().collect());
+    // Explicit decimal refs replace numeric inference for the decimal format.
+    let cols_idx_decimal = cols_idx_decimal.unwrap_or(cols_idx_numeric);
+    // Every column starts from one of three kinds, so merge the base patch once per
+    // kind instead of once per column, and not at all when it is empty.
+    let base_patch = &options_write.base_format_patch;
+    let fmt_text_base = merge_base_format_patch(fmt_text, base_patch);
+
+    // Text-only slices need no masks: every column gets the text format.
+    if cols_idx_integer.is_empty() && cols_idx_decimal.is_empty() && cols_fmt_overrides.is_empty() {
+        let fmt_text_base = fmt_text_base.into_owned();
+        return ColumnFormatPlan {
+            fmts_by_col: vec![fmt_text_base.clone(); width_data],
+            fmts_base_by_col: vec![fmt_text_base; width_data],
+        };
+    }
+
+    let is_integer_by_col = create_column_mask(width_data, cols_idx_integer);
+    let is_decimal_by_col = create_column_mask(width_data, cols_idx_decimal);
+    let fmt_integer_base = merge_base_format_patch(fmt_integer, base_patch);
+    let fmt_decimal_base = merge_base_format_patch(fmt_decimal, base_patch);
     let mut fmts_base_by_col = Vec::with_capacity(width_data);
     let mut fmts_by_col = Vec::with_capacity(width_data);
 
     for _col_idx in 0..width_data {
         let col_idx = _col_idx;
-        let mut fmt_base = if integer_cols_idx.contains(&col_idx) {
-            fmt_integer.clone()
-        } else if decimal_cols_idx
-            .as_ref()
-            .map_or(numeric_cols_idx.contains(&col_idx), |indices| {
-                indices.contains(&col_idx)
-            })
-        {
-            fmt_decimal.clone()
+        let fmt_base: &CellFormatPatch = if is_integer_by_col[col_idx] {
+            &fmt_integer_base
+        } else if is_decimal_by_col[col_idx] {
+            &fmt_decimal_base
         } else {
-            fmt_text.clone()
+            &fmt_text_base
         };
 
-        fmt_base = fmt_base.merge(&options_write.base_format_patch);
-
         let fmt_final = if let Some(fmt_override) = cols_fmt_overrides.get(&col_idx) {
             fmt_base.merge(fmt_override)
         } else {
             fmt_base.clone()
         };
 
-        fmts_base_by_col.push(fmt_base);
+        fmts_base_by_col.push(fmt_base.clone());
         fmts_by_col.push(fmt_final);
     }
 
@@ -1841,76 +1886,43 @@ fn is_scientific_candidate_col(
     }
 }
 
-fn should_use_scientific_value(
-    value: &CellValue,
-    is_numeric_col: bool,
-    is_scientific_candidate: bool,
-    policy_scientific: &ScientificPolicy,
-) -> bool {
-    if !is_numeric_col || !is_scientific_candidate {
-        return false;
-    }
-    let CellValue::Number(value_num) = value else {
-        return false;
-    };
+/// Whether a finite number falls outside `[thr_min, thr_max)` (zero excluded) and so
+/// renders in scientific notation.
+fn is_scientific_number(value_num: f64, thr_min: f64, thr_max: f64) -> bool {
     if !value_num.is_finite() {
         return false;
     }
     let value_abs = value_num.abs();
-    value_abs >= policy_scientific.thr_max
-        || (value_abs > 0.0 && value_abs < policy_scientific.thr_min)
-}
-
-fn select_numeric_column_indices(df: &DataFrame) -> Vec<usize> {
-    df.get_columns()
-        .iter()
-        .enumerate()
-        .filter_map(|(idx, col)| {
-            if col.dtype().is_numeric() {
-                Some(idx)
-            } else {
-                None
-            }
-        })
-        .collect()
+    value_abs >= thr_max || (value_abs > 0.0 && value_abs < thr_min)
 }
 
-fn select_integer_column_indices(df: &DataFrame, cols_idx_numeric: &[usize]) -> Vec<usize> {
-    cols_idx_numeric
-        .iter()
-        .copied()
-        .filter(|idx| df.get_columns()[*idx].dtype().is_integer())
-        .collect()
-}
-
-fn select_numeric_column_indices_from_arrow_schema(schema: &ArrowSchema) -> Vec<usize> {
-    schema
-        .iter_values()
-        .enumerate()
-        .filter_map(|(idx, field)| {
-            if is_arrow_numeric_dtype(field.dtype()) {
-                Some(idx)
-            } else {
-                None
-            }
-        })
-        .collect()
+/// Infer numeric and integer column indices from `(is_numeric, is_integer)` dtype flags.
+///
+/// One pass over the columns fills both lists; integer inference only considers
+/// numeric columns, so it is empty when numeric inference is disabled.
+fn select_inferred_column_indices(
+    dtype_flags_by_col: impl Iterator<Item = (bool, bool)>,
+    options_write: &XlsxWriteOptions,
+) -> (Vec<usize>, Vec<usize>) {
+    let mut cols_idx_numeric = vec![];
+    let mut cols_idx_integer = vec![];
+    if !options_write.should_infer_numeric_cols {
+        return (cols_idx_numeric, cols_idx_integer);
+    }
+    for (_idx, (_is_numeric, _is_integer)) in dtype_flags_by_col.enumerate() {
+        if !_is_numeric {
+            continue;
+        }
+        cols_idx_numeric.push(_idx);
+        if options_write.should_infer_integer_cols && _is_integer {
+            cols_idx_integer.push(_idx);
+        }
+    }
+    (cols_idx_numeric, cols_idx_integer)
 }
 
-fn select_integer_column_indices_from_arrow_schema(
-    schema: &ArrowSchema,
-    cols_idx_numeric: &[usize],
-) -> Vec<usize> {
-    cols_idx_numeric
-        .iter()
-        .copied()
-        .filter(|idx| {
-            schema
-                .get_at_index(*idx)
-                .map(|(_, field)| is_arrow_integer_dtype(field.dtype()))
-                .unwrap_or(false)
-        })
-        .collect()
+fn classify_arrow_dtype(dtype: &ArrowDataType) -> (bool, bool) {
+    (is_arrow_numeric_dtype(dtype), is_arrow_integer_dtype(dtype))
 }
 
 fn is_arrow_numeric_dtype(dtype: &ArrowDataType) -> bool {
@@ -1935,6 +1947,78 @@ fn is_arrow_numeric_dtype(dtype: &ArrowDataType) -> bool {
     )
 }
 
+/// Dtypes whose cell values are read straight from Arrow buffers.
+fn is_arrow_cell_dtype_native(dtype: &ArrowDataType) -> bool {
+    matches!(
+        dtype,
+        ArrowDataType::Null
+            | ArrowDataType::Boolean
+            | ArrowDataType::Int8
+            | ArrowDataType::Int16
+            | ArrowDataType::Int32
+            | ArrowDataType::Int64
+            | ArrowDataType::Int128
+            | ArrowDataType::UInt8
+            | ArrowDataType::UInt16
+            | ArrowDataType::UInt32
+            | ArrowDataType::UInt64
+            | ArrowDataType::Float32
+            | ArrowDataType::Float64
+            | ArrowDataType::Utf8
+            | ArrowDataType::LargeUtf8
+            | ArrowDataType::Utf8View
+    )
+}
+
+/// Whether a Polars column's physical chunks map to cells without logical formatting.
+///
+/// Logical dtypes (dates, decimals, categoricals, ...) keep the `AnyValue` path so
+/// their display text is preserved.
+fn is_polars_cell_dtype_native(dtype: &DataType) -> bool {
+    matches!(
+        dtype,
+        DataType::Null
+            | DataType::Boolean
+            | DataType::Int8
+            | DataType::Int16
+            | DataType::Int32
+            | DataType::Int64
+            | DataType::UInt8
+            | DataType::UInt16
+            | DataType::UInt32
+            | DataType::UInt64
+            | DataType::Float32
+            | DataType::Float64
+            | DataType::String
+    )
+}
+
+/// Estimate bytes per row from Arrow field dtypes, for byte-targeted row chunking.
+///
+/// This is the single dtype-size table; the Python facade reaches it through the bridge.
+pub fn estimate_arrow_row_bytes(schema: &ArrowSchema) -> usize {
+    schema
+        .iter_values()
+        .map(|field| match field.dtype() {
+            ArrowDataType::Null => 0,
+            ArrowDataType::Boolean | ArrowDataType::Int8 | ArrowDataType::UInt8 => 1,
+            ArrowDataType::Int16 | ArrowDataType::UInt16 | ArrowDataType::Float16 => 2,
+            ArrowDataType::Int32
+            | ArrowDataType::UInt32
+            | ArrowDataType::Float32
+            | ArrowDataType::Date32 => 4,
+            ArrowDataType::Int128 => 16,
+            ArrowDataType::Utf8
+            | ArrowDataType::LargeUtf8
+            | ArrowDataType::Utf8View
+            | ArrowDataType::Binary
+            | ArrowDataType::LargeBinary
+            | ArrowDataType::BinaryView => NBYTES_STRING_CELL_ESTIMATED,
+            _ => 8,
+        })
+        .sum()
+}
+
 fn is_arrow_integer_dtype(dtype: &ArrowDataType) -> bool {
     matches!(
         dtype,
@@ -1951,17 +2035,13 @@ fn is_arrow_integer_dtype(dtype: &ArrowDataType) -> bool {
 }
 
 fn extract_string_grid_from_dataframe(df: &DataFrame) -> Result<Vec<Vec<String>>, String> {
-    let height = df.height();
-    let width = df.width();
-    let cols = df.get_columns();
-
-    let mut grid = vec![vec![String::new(); width]; height];
-    for (_row_index, _row_values) in grid.iter_mut().enumerate() {
-        for (_col_index, _cell_value) in _row_values.iter_mut().enumerate() {
-            let value = cols[_col_index]
-                .get(_row_index)
-                .map_err(|err| format!("Failed to read header cell value: {err}"))?;
-            *_cell_value = format_header_text_from_any_value(value);
+    let mut grid = vec![Vec::with_capacity(df.width()); df.height()];
+    // Walk each column once with a series iterator instead of resolving every cell
+    // through `Column::get`.
+    for _col in df.get_columns() {
+        let series = _col.as_materialized_series().rechunk();
+        for (_row_values, _value) in grid.iter_mut().zip(series.iter()) {
+            _row_values.push(format_header_text_from_any_value(_value));
         }
     }
 
@@ -2000,107 +2080,196 @@ fn convert_any_value_to_cell_value(value: AnyValue<'_>) -> CellValue {
     }
 }
 
-fn convert_arrow_value_to_cell_value(
-    array: &dyn ArrowArray,
-    row_idx: usize,
-) -> Result<CellValue, String> {
-    if array.is_null(row_idx) {
-        return Ok(CellValue::None);
+/// Convert rows `[row_start, row_end)` of one batch column into normalized cell values.
+///
+/// The column is downcast once per call instead of once per cell.
+#[allow(clippy::too_many_arguments)]
+fn convert_batch_column_to_cell_values(
+    batch: &XlsxBatchCells,
+    col_idx: usize,
+    row_start: usize,
+    row_end: usize,
+    is_numeric_col: bool,
+    is_integer_col: bool,
+    should_keep_missing_values: bool,
+    value_policy: &XlsxValuePolicy,
+) -> Result<Vec<CellValue>, String> {
+    let values_raw = match batch {
+        XlsxBatchCells::Arrow(batch) => {
+            extract_arrow_array_cell_values(batch.arrays()[col_idx].as_ref(), row_start, row_end)?
+        }
+        XlsxBatchCells::DataFrame(df) => {
+            extract_column_cell_values(&df.get_columns()[col_idx], row_start, row_end)?
+        }
+    };
+    Ok(normalize_cell_values(
+        values_raw,
+        is_numeric_col,
+        is_integer_col,
+        should_keep_missing_values,
+        value_policy,
+    ))
+}
+
+fn normalize_cell_values(
+    values_raw: Vec<CellValue>,
+    is_numeric_col: bool,
+    is_integer_col: bool,
+    should_keep_missing_values: bool,
+    value_policy: &XlsxValuePolicy,
+) -> Vec<CellValue> {
+    let converter = CellValueConverter::new(
+        is_numeric_col,
+        is_integer_col,
+        should_keep_missing_values,
+        value_policy,
+    );
+    values_raw
+        .into_iter()
+        .map(|value_raw| converter.convert(value_raw))
+        .collect()
+}
+
+fn extract_column_cell_values(
+    col: &Column,
+    row_start: usize,
+    row_end: usize,
+) -> Result<Vec<CellValue>, String> {
+    let col_slice = col.slice(row_start as i64, row_end - row_start);
+    let series = col_slice.as_materialized_series();
+    // Plain physical dtypes: walk the typed Arrow chunks instead of resolving an
+    // `AnyValue` per cell.
+    if is_polars_cell_dtype_native(col.dtype())
+        && series
+            .chunks()
+            .iter()
+            .all(|chunk| is_arrow_cell_dtype_native(chunk.dtype()))
+    {
+        let mut values = Vec::with_capacity(row_end - row_start);
+        for _chunk in series.chunks() {
+            values.extend(extract_arrow_array_cell_values(
+                _chunk.as_ref(),
+                0,
+                _chunk.len(),
+            )?);
+        }
+        return Ok(values);
     }
 
-    macro_rules! primitive_number {
-        ($array_ty:ty) => {{
-            let arr = array.as_any().downcast_ref::<$array_ty>().ok_or_else(|| {
-                format!(
-                    "Failed to downcast Arrow array with dtype {:?}",
-                    array.dtype()
-                )
-            })?;
-            Ok(CellValue::Number(arr.value(row_idx) as f64))
+    // Other dtypes go through `AnyValue`. `Column::get` locates the chunk again for
+    // every row, which degrades badly on many-chunk columns. Rechunk the slice once
+    // and iterate it sequentially instead.
+    Ok(series
+        .rechunk()
+        .iter()
+        .map(convert_any_value_to_cell_value)
+        .collect())
+}
+
+fn extract_arrow_array_cell_values(
+    array: &dyn ArrowArray,
+    row_start: usize,
+    row_end: usize,
+) -> Result<Vec<CellValue>, String> {
+    macro_rules! collect_values {
+        ($array_ty:ty, $convert:expr) => {{
+            let arr = downcast_arrow_array::<$array_ty>(array)?;
+            Ok((row_start..row_end)
+                .map(|row_idx| {
+                    if arr.is_null(row_idx) {
+                        CellValue::None
+                    } else {
+                        $convert(arr.value(row_idx))
+                    }
+                })
+                .collect())
+        }};
+    }
+    // Numeric columns read the value buffer in place; the validity bitmap is only
+    // consulted when the array actually carries nulls.
+    macro_rules! primitive_numbers {
+        ($native_ty:ty) => {{
+            let arr = downcast_arrow_array::<PrimitiveArray<$native_ty>>(array)?;
+            let values = &arr.values().as_slice()[row_start..row_end];
+            Ok(if arr.null_count() == 0 {
+                values
+                    .iter()
+                    .map(|val| CellValue::Number(*val as f64))
+                    .collect()
+            } else {
+                values
+                    .iter()
+                    .zip(row_start..row_end)
+                    .map(|(val, row_idx)| {
+                        if arr.is_null(row_idx) {
+                            CellValue::None
+                        } else {
+                            CellValue::Number(*val as f64)
+                        }
+                    })
+                    .collect()
+            })
         }};
     }
 
     match array.dtype() {
-        ArrowDataType::Null => Ok(CellValue::None),
-        ArrowDataType::Boolean => {
-            let arr = array
-                .as_any()
-                .downcast_ref::<BooleanArray>()
-                .ok_or_else(|| {
-                    format!(
-                        "Failed to downcast Arrow array with dtype {:?}",
-                        array.dtype()
-                    )
-                })?;
-            Ok(CellValue::String(
-                if arr.value(row_idx) { "True" } else { "False" }.to_string(),
-            ))
-        }
-        ArrowDataType::Int8 => primitive_number!(PrimitiveArray<i8>),
-        ArrowDataType::Int16 => primitive_number!(PrimitiveArray<i16>),
-        ArrowDataType::Int32 => primitive_number!(PrimitiveArray<i32>),
-        ArrowDataType::Int64 => primitive_number!(PrimitiveArray<i64>),
-        ArrowDataType::Int128 => primitive_number!(PrimitiveArray<i128>),
-        ArrowDataType::UInt8 => primitive_number!(PrimitiveArray<u8>),
-        ArrowDataType::UInt16 => primitive_number!(PrimitiveArray<u16>),
-        ArrowDataType::UInt32 => primitive_number!(PrimitiveArray<u32>),
-        ArrowDataType::UInt64 => primitive_number!(PrimitiveArray<u64>),
-        ArrowDataType::Float32 => primitive_number!(PrimitiveArray<f32>),
-        ArrowDataType::Float64 => primitive_number!(PrimitiveArray<f64>),
-        ArrowDataType::Utf8 => {
-            let arr = array
-                .as_any()
-                .downcast_ref::<Utf8Array<i32>>()
-                .ok_or_else(|| {
-                    format!(
-                        "Failed to downcast Arrow array with dtype {:?}",
-                        array.dtype()
-                    )
-                })?;
-            Ok(CellValue::String(arr.value(row_idx).to_string()))
-        }
-        ArrowDataType::LargeUtf8 => {
-            let arr = array
-                .as_any()
-                .downcast_ref::<Utf8Array<i64>>()
-                .ok_or_else(|| {
-                    format!(
-                        "Failed to downcast Arrow array with dtype {:?}",
-                        array.dtype()
-                    )
-                })?;
-            Ok(CellValue::String(arr.value(row_idx).to_string()))
-        }
-        ArrowDataType::Utf8View => {
-            let arr = array
-                .as_any()
-                .downcast_ref::<Utf8ViewArray>()
-                .ok_or_else(|| {
-                    format!(
-                        "Failed to downcast Arrow array with dtype {:?}",
-                        array.dtype()
-                    )
-                })?;
-            Ok(CellValue::String(arr.value(row_idx).to_string()))
-        }
-        dtype => Ok(CellValue::String(format!("{dtype:?}"))),
+        ArrowDataType::Null => Ok(vec![CellValue::None; row_end - row_start]),
+        ArrowDataType::Boolean => collect_values!(BooleanArray, |val: bool| {
+            CellValue::String(if val { "True" } else { "False" }.to_string())
+        }),
+        ArrowDataType::Int8 => primitive_numbers!(i8),
+        ArrowDataType::Int16 => primitive_numbers!(i16),
+        ArrowDataType::Int32 => primitive_numbers!(i32),
+        ArrowDataType::Int64 => primitive_numbers!(i64),
+        ArrowDataType::Int128 => primitive_numbers!(i128),
+        ArrowDataType::UInt8 => primitive_numbers!(u8),
+        ArrowDataType::UInt16 => primitive_numbers!(u16),
+        ArrowDataType::UInt32 => primitive_numbers!(u32),
+        ArrowDataType::UInt64 => primitive_numbers!(u64),
+        ArrowDataType::Float32 => primitive_numbers!(f32),
+        ArrowDataType::Float64 => primitive_numbers!(f64),
+        ArrowDataType::Utf8 => collect_values!(Utf8Array<i32>, |val: &str| {
+            CellValue::String(val.to_string())
+        }),
+        ArrowDataType::LargeUtf8 => collect_values!(Utf8Array<i64>, |val: &str| {
+            CellValue::String(val.to_string())
+        }),
+        ArrowDataType::Utf8View => collect_values!(Utf8ViewArray, |val: &str| {
+            CellValue::String(val.to_string())
+        }),
+        dtype => Ok((row_start..row_end)
+            .map(|row_idx| {
+                if array.is_null(row_idx) {
+                    CellValue::None
+                } else {
+                    CellValue::String(format!("{dtype:?}"))
+                }
+            })
+            .collect()),
     }
 }
 
+fn downcast_arrow_array<T: 'static>(array: &dyn ArrowArray) -> Result<&T, String> {
+    array.as_any().downcast_ref::<T>().ok_or_else(|| {
+        format!(
+            "Failed to downcast Arrow array with dtype {:?}",
+            array.dtype()
+        )
+    })
+}
+
+/// Rebase the ascending `indices` falling in `[col_start_inclusive, col_end_exclusive)`
+/// onto the slice, locating the window by binary search instead of a full scan.
 fn calculate_slice_indices(
     indices: &[usize],
     col_start_inclusive: usize,
     col_end_exclusive: usize,
 ) -> Vec<usize> {
-    indices
+    let pos_start = indices.partition_point(|idx| *idx < col_start_inclusive);
+    let pos_end = indices.partition_point(|idx| *idx < col_end_exclusive);
+    indices[pos_start..pos_end.max(pos_start)]
         .iter()
-        .filter_map(|idx| {
-            if *idx >= col_start_inclusive && *idx < col_end_exclusive {
-                Some(*idx - col_start_inclusive)
-            } else {
-                None
-            }
-        })
+        .map(|idx| idx - col_start_inclusive)
         .collect()
 }
 
@@ -2135,32 +2304,28 @@ fn write_header_cell(
     Ok(())
 }
 
+/// Write the header rows of one column slice from a full-width merge plan.
 fn write_header(
     worksheet: &mut Worksheet,
-    mut header_grid: Vec<Vec<String>>,
-    should_merge: bool,
+    header_merge_plan: &HeaderMergePlan,
+    col_start_inclusive: usize,
+    col_end_exclusive: usize,
     fmt_header: &Format,
 ) -> Result<(), String> {
-    if !should_merge {
-        for (_row_idx, _row_values) in header_grid.iter().enumerate() {
-            for (_col_idx, _cell_value) in _row_values.iter().enumerate() {
-                write_header_cell(worksheet, _row_idx, _col_idx, _cell_value, fmt_header)?;
-            }
-        }
-        return Ok(());
-    }
-
-    apply_vertical_run_text_blankout(&mut header_grid);
-    let horizontal_merges_by_row = plan_horizontal_merges(&header_grid);
-    let horizontal_merge_tracker = create_horizontal_merge_tracker(&horizontal_merges_by_row);
+    let horizontal_merges_by_row =
+        header_merge_plan.slice_horizontal_merges(col_start_inclusive, col_end_exclusive);
+    let header_grid = header_merge_plan.header_grid();
+    let horizontal_merge_masks = create_horizontal_merge_mask(
+        &horizontal_merges_by_row,
+        header_grid.len(),
+        col_end_exclusive - col_start_inclusive,
+    );
 
     for (_row_idx, _row_values) in header_grid.iter().enumerate() {
-        for (_col_idx, _cell_value) in _row_values.iter().enumerate() {
-            if horizontal_merge_tracker
-                .get(&(_row_idx, _col_idx))
-                .copied()
-                .unwrap_or(false)
-            {
+        let row_values = &_row_values[col_start_inclusive..col_end_exclusive];
+        let row_mask = &horizontal_merge_masks[_row_idx];
+        for (_col_idx, _cell_value) in row_values.iter().enumerate() {
+            if row_mask[_col_idx] {
                 continue;
             }
 
@@ -2187,43 +2352,141 @@ fn write_header(
     Ok(())
 }
 
+/// Cell format selection for one column, resolved once per sheet slice.
+#[derive(Debug, Clone, Copy)]
+enum ColumnCellFormat<'a> {
+    /// Every cell uses the column format.
+    Fixed(&'a Format),
+    /// Finite numbers outside the policy thresholds switch to the scientific format.
+    Scientific {
+        fmt_base: &'a Format,
+        fmt_scientific: &'a Format,
+        thr_min: f64,
+        thr_max: f64,
+    },
+}
+
+impl<'a> ColumnCellFormat<'a> {
+    fn select(&self, value: &CellValue) -> &'a Format {
+        match *self {
+            Self::Fixed(fmt) => fmt,
+            Self::Scientific {
+                fmt_base,
+                fmt_scientific,
+                thr_min,
+                thr_max,
+            } => match value {
+                CellValue::Number(value_num)
+                    if is_scientific_number(*value_num, thr_min, thr_max) =>
+                {
+                    fmt_scientific
+                }
+                _ => fmt_base,
+            },
+        }
+    }
+}
+
+fn create_column_cell_formats<'a>(
+    data_formats_by_col: &'a [Format],
+    fmt_scientific: &'a Format,
+    is_numeric_by_col: &[bool],
+    is_scientific_candidate_by_col: &[bool],
+    policy_scientific: &ScientificPolicy,
+) -> Vec<ColumnCellFormat<'a>> {
+    data_formats_by_col
+        .iter()
+        .enumerate()
+        .map(|(col_idx, fmt_base)| {
+            if is_numeric_by_col[col_idx] && is_scientific_candidate_by_col[col_idx] {
+                ColumnCellFormat::Scientific {
+                    fmt_base,
+                    fmt_scientific,
+                    thr_min: policy_scientific.thr_min,
+                    thr_max: policy_scientific.thr_max,
+                }
+            } else {
+                ColumnCellFormat::Fixed(fmt_base)
+            }
+        })
+        .collect()
+}
+
+/// Emit column-converted values row-major, as constant-memory worksheets require.
+///
+/// All columns in `values_by_col` must have the same length; the first row lands
+/// on worksheet row `row_start`.
+fn write_cells_row_major(
+    worksheet: &mut Worksheet,
+    row_start: usize,
+    values_by_col: &[Vec<CellValue>],
+    cell_formats_by_col: &[ColumnCellFormat<'_>],
+) -> Result<(), String> {
+    let Some(num_rows) = values_by_col.first().map(Vec::len) else {
+        return Ok(());
+    };
+    // Column numbers are bounded by the slice width, so one cast check covers
+    // every cell; rows are cast once per row.
+    cast_col_num(values_by_col.len() - 1)?;
+    for _row_pos in 0..num_rows {
+        let row_num = cast_row_num(row_start + _row_pos)?;
+        // Walk columns and formats in lockstep instead of indexing both per cell.
+        let cols_with_format = values_by_col.iter().zip(cell_formats_by_col);
+        for (col_num, (values, cell_format)) in (0u16..).zip(cols_with_format) {
+            let value = &values[_row_pos];
+            write_cell_with_format(
+                worksheet,
+                row_num,
+                col_num,
+                value,
+                cell_format.select(value),
+            )?;
+        }
+    }
+    Ok(())
+}
+
 fn write_cell_with_format(
     worksheet: &mut Worksheet,
-    row_idx: usize,
-    col_idx: usize,
+    row_num: u32,
+    col_num: u16,
     value: &CellValue,
     format: &Format,
 ) -> Result<(), String> {
     match value {
         CellValue::None => {
             worksheet
-                .write_blank(cast_row_num(row_idx)?, cast_col_num(col_idx)?, format)
+                .write_blank(row_num, col_num, format)
                 .map_err(format_xlsx_error_text)?;
         }
         CellValue::String(val) => {
             worksheet
-                .write_string_with_format(
-                    cast_row_num(row_idx)?,
-                    cast_col_num(col_idx)?,
-                    val,
-                    format,
-                )
+                .write_string_with_format(row_num, col_num, val, format)
                 .map_err(format_xlsx_error_text)?;
         }
         CellValue::Number(val) => {
             worksheet
-                .write_number_with_format(
-                    cast_row_num(row_idx)?,
-                    cast_col_num(col_idx)?,
-                    *val,
-                    format,
-                )
+                .write_number_with_format(row_num, col_num, *val, format)
                 .map_err(format_xlsx_error_text)?;
         }
     }
     Ok(())
 }
 
+/// Build one `Format` per patch, constructing each distinct patch only once.
+fn create_rust_xlsx_formats(specs: &[CellFormatPatch]) -> Vec<Format> {
+    let mut formats_by_spec: HashMap<&CellFormatPatch, Format> = HashMap::new();
+    specs
+        .iter()
+        .map(|spec| {
+            formats_by_spec
+                .entry(spec)
+                .or_insert_with(|| create_rust_xlsx_format(spec))
+                .clone()
+        })
+        .collect()
+}
+
 fn create_rust_xlsx_format(spec: &CellFormatPatch) -> Format {
     let mut format = Format::new();
 
@@ -2335,3 +2598,439 @@ fn cast_col_num(value: usize) -> Result<u16, String> {
 fn format_xlsx_error_text(err: XlsxError) -> String {
     format!("xlsx write error: {err}")
 }
+
+#[cfg(test)]
+mod tests {
+    use std::sync::Arc;
+
+    use arrow::array::{BinaryViewArray, new_empty_array};
+    use arrow::datatypes::{Field as ArrowField, IntegerType};
+    use polars::prelude::{NamedFrom, Series};
+
+    use super::*;
+
+    const WIDTH_MISSING: usize = 2;
+
+    /// Baseline autofit scan: measure every value until the width saturates.
+    fn calculate_body_column_width_per_value(
+        values: &[CellValue],
+        width_saturated: usize,
+        is_numeric_col: bool,
+        is_integer_col: bool,
+        is_scientific_candidate: bool,
+        policy_scientific: &ScientificPolicy,
+    ) -> usize {
+        let mut width = 0;
+        for value in values {
+            if width >= width_saturated {
+                break;
+            }
+            width = usize::max(
+                width,
+                estimate_width_len(
+                    value,
+                    is_numeric_col,
+                    is_integer_col,
+                    is_scientific_candidate,
+                    policy_scientific,
+                    WIDTH_MISSING,
+                ),
+            );
+        }
+        width
+    }
+
+    /// Assert the range-based width resolves to the same column width as the baseline scan.
+    ///
+    /// Widths at or past saturation all clamp to `width_cell_max` in
+    /// [`apply_column_widths`], so only whether both saturated is compared there.
+    fn assert_body_column_width_matches_per_value(
+        values: &[CellValue],
+        width_saturated: usize,
+        is_numeric_col: bool,
+        is_integer_col: bool,
+        is_scientific_candidate: bool,
+        policy_scientific: &ScientificPolicy,
+    ) -> usize {
+        let width_expected = calculate_body_column_width_per_value(
+            values,
+            width_saturated,
+            is_numeric_col,
+            is_integer_col,
+            is_scientific_candidate,
+            policy_scientific,
+        );
+        let width = calculate_body_column_width(
+            values,
+            0,
+            width_saturated,
+            is_numeric_col,
+            is_integer_col,
+            is_scientific_candidate,
+            policy_scientific,
+            WIDTH_MISSING,
+        );
+        if width_expected >= width_saturated {
+            assert!(
+                width >= width_saturated,
+                "{values:?}: {width} < {width_saturated}"
+            );
+        } else {
+            assert_eq!(width, width_expected, "{values:?}");
+        }
+        width
+    }
+
+    fn create_numbers(values: &[f64]) -> Vec<CellValue> {
+        values.iter().map(|val| CellValue::Number(*val)).collect()
+    }
+
+    #[test]
+    fn test_body_column_width_keeps_negative_zero_and_negatives() {
+        let policy = ScientificPolicy::default();
+        let values = create_numbers(&[0.0, -0.0, 3.0]);
+
+        // Decimal `-0.0` renders as "-0.0000"; integer `-0.0` renders as "0".
+        assert_eq!(
+            assert_body_column_width_matches_per_value(&values, 100, true, false, false, &policy),
+            7
+        );
+        assert_eq!(
+            assert_body_column_width_matches_per_value(&values, 100, true, true, false, &policy),
+            1
+        );
+
+        let values = create_numbers(&[-0.5, -12.25, -3.0]);
+        assert_eq!(
+            assert_body_column_width_matches_per_value(&values, 100, true, false, false, &policy),
+            8
+        );
+        assert_eq!(
+            assert_body_column_width_matches_per_value(&values, 100, true, true, false, &policy),
+            3
+        );
+    }
+
+    #[test]
+    fn test_body_column_width_covers_mixed_sign_columns() {
+        let policy = ScientificPolicy::default();
+        let values = create_numbers(&[5.0, -123.25, 99_999.5, -1.0, 0.0]);
+
+        assert_eq!(
+            assert_body_column_width_matches_per_value(&values, 100, true, false, false, &policy),
+            10
+        );
+        assert_eq!(
+            assert_body_column_width_matches_per_value(&values, 100, true, true, false, &policy),
+            5
+        );
+
+        // Strings and missing cells in a numeric column are still measured per value.
+        let mut values = values;
+        values.push(CellValue::None);
+        values.push(CellValue::String("not a number".to_string()));
+        assert_eq!(
+            assert_body_column_width_matches_per_value(&values, 100, true, false, false, &policy),
+            12
+        );
+    }
+
+    #[test]
+    fn test_body_column_width_measures_scientific_columns_per_value() {
+        let policy = ScientificPolicy {
+            scope: ScientificScope::All,
+            thr_min: 0.0001,
+            thr_max: 1_000_000.0,
+        };
+        // The extremes render in scientific notation ("1.00E-5" and "1.23E8"), but
+        // the widest cell is the plain "5000.0000" inside the range.
+        let values = create_numbers(&[0.00001, 123_456_789.0, 5_000.0]);
+
+        assert_eq!(
+            assert_body_column_width_matches_per_value(&values, 100, true, false, true, &policy),
+            9
+        );
+    }
+
+    #[test]
+    fn test_body_column_width_of_null_only_column_is_missing_width() {
+        let policy = ScientificPolicy::default();
+        let values = vec![CellValue::None; 3];
+
+        assert_eq!(
+            assert_body_column_width_matches_per_value(&values, 100, true, false, false, &policy),
+            WIDTH_MISSING
+        );
+        assert_eq!(
+            assert_body_column_width_matches_per_value(&values, 100, false, false, false, &policy),
+            WIDTH_MISSING
+        );
+        assert_eq!(
+            assert_body_column_width_matches_per_value(&[], 100, true, false, false, &policy),
+            0
+        );
+    }
+
+    #[test]
+    fn test_body_column_width_stops_once_saturated() {
+        let policy = ScientificPolicy::default();
+        let values = ["ab", "abcdefgh", "abcdefghijklmnop"]
+            .iter()
+            .map(|val| CellValue::String(val.to_string()))
+            .collect::<Vec<_>>();
+
+        // Text columns stop at the value that saturates, exactly like the baseline.
+        assert_eq!(
+            assert_body_column_width_matches_per_value(&values, 5, false, false, false, &policy),
+            8
+        );
+
+        let values = create_numbers(&[1.0, 1_234.5, 123_456_789.0]);
+        assert!(
+            assert_body_column_width_matches_per_value(&values, 8, true, false, false, &policy)
+                >= 8
+        );
+        assert_eq!(
+            calculate_body_column_width(&values, 8, 8, true, false, false, &policy, 0),
+            8
+        );
+    }
+
+    #[test]
+    fn test_extract_arrow_array_cell_values_reads_primitive_buffers() {
+        let array = PrimitiveArray::<i32>::from_vec(vec![1, -2, 3]);
+        assert_eq!(
+            extract_arrow_array_cell_values(&array, 0, 3).unwrap(),
+            create_numbers(&[1.0, -2.0, 3.0])
+        );
+        assert_eq!(
+            extract_arrow_array_cell_values(&array, 1, 3).unwrap(),
+            create_numbers(&[-2.0, 3.0])
+        );
+
+        let array = PrimitiveArray::<f64>::from(vec![Some(1.5), None, Some(-2.0)]);
+        let values = extract_arrow_array_cell_values(&array, 0, 3).unwrap();
+        assert_eq!(
+            values,
+            vec![
+                CellValue::Number(1.5),
+                CellValue::None,
+                CellValue::Number(-2.0),
+            ]
+        );
+        assert_eq!(
+            normalize_cell_values(values, true, false, true, &XlsxValuePolicy::default()),
+            vec![
+                CellValue::Number(1.5),
+                CellValue::String("NA".to_string()),
+                CellValue::Number(-2.0),
+            ]
+        );
+    }
+
+    #[test]
+    fn test_extract_arrow_array_cell_values_respects_slice_offset() {
+        // Nulls inside the slice take the validity branch at the shifted positions.
+        let array =
+            PrimitiveArray::<i64>::from(vec![Some(10), None, Some(30), Some(40)]).sliced(1, 3);
+        assert_eq!(array.null_count(), 1);
+        assert_eq!(
+            extract_arrow_array_cell_values(&array, 0, 3).unwrap(),
+            vec![
+                CellValue::None,
+                CellValue::Number(30.0),
+                CellValue::Number(40.0),
+            ]
+        );
+        assert_eq!(
+            extract_arrow_array_cell_values(&array, 1, 3).unwrap(),
+            create_numbers(&[30.0, 40.0])
+        );
+
+        // A slice that leaves the only null behind takes the buffer branch.
+        let array = PrimitiveArray::<u8>::from(vec![None, Some(2), Some(3)]).sliced(1, 2);
+        assert_eq!(array.null_count(), 0);
+        assert_eq!(
+            extract_arrow_array_cell_values(&array, 0, 2).unwrap(),
+            create_numbers(&[2.0, 3.0])
+        );
+    }
+
+    /// Baseline per-cell read through `Column::get`.
+    fn extract_column_cell_values_per_cell(
+        col: &Column,
+        row_start: usize,
+        row_end: usize,
+    ) -> Vec<CellValue> {
+        (row_start..row_end)
+            .map(|row_idx| convert_any_value_to_cell_value(col.get(row_idx).unwrap()))
+            .collect()
+    }
+
+    #[test]
+    fn test_extract_column_cell_values_walks_native_chunks_in_order() {
+        let mut series = Series::new("x".into(), &[Some(1i64), None, Some(3)]);
+        series
+            .append(&Series::new("x".into(), &[Some(4i64), Some(5)]))
+            .unwrap();
+        assert_eq!(series.n_chunks(), 2);
+        let col = Column::from(series);
+
+        assert_eq!(
+            extract_column_cell_values(&col, 0, 5).unwrap(),
+            vec![
+                CellValue::Number(1.0),
+                CellValue::None,
+                CellValue::Number(3.0),
+                CellValue::Number(4.0),
+                CellValue::Number(5.0),
+            ]
+        );
+        // A slice spanning the chunk boundary keeps both partial chunks.
+        assert_eq!(
+            extract_column_cell_values(&col, 1, 4).unwrap(),
+            extract_column_cell_values_per_cell(&col, 1, 4)
+        );
+    }
+
+    #[test]
+    fn test_extract_column_cell_values_rechunks_non_native_columns_in_order() {
+        // Binary is always compiled in and takes the `AnyValue` fallback like dates
+        // and categoricals do.
+        let mut series = Series::new("b".into(), &[Some(b"ab".as_slice()), None]);
+        series
+            .append(&Series::new(
+                "b".into(),
+                &[Some(b"cd".as_slice()), Some(b"ef".as_slice())],
+            ))
+            .unwrap();
+        assert_eq!(series.n_chunks(), 2);
+        let col = Column::from(series);
+        assert!(!is_polars_cell_dtype_native(col.dtype()));
+
+        let values = extract_column_cell_values(&col, 0, 4).unwrap();
+        assert_eq!(values, extract_column_cell_values_per_cell(&col, 0, 4));
+        assert_eq!(values[1], CellValue::None);
+        assert!(
+            values
+                .iter()
+                .enumerate()
+                .all(|(idx, value)| idx == 1 || matches!(value, CellValue::String(_)))
+        );
+        assert_eq!(
+            extract_column_cell_values(&col, 1, 3).unwrap(),
+            extract_column_cell_values_per_cell(&col, 1, 3)
+        );
+    }
+
+    fn create_record_batch(columns: Vec<(&str, Box<dyn ArrowArray>)>) -> XlsxRecordBatch {
+        let height = columns.first().map_or(0, |(_, array)| array.len());
+        let schema = columns
+            .iter()
+            .map(|(name, array)| {
+                let field = ArrowField::new((*name).into(), array.dtype().clone(), true);
+                (field.name.clone(), field)
+            })
+            .collect::<ArrowSchema>();
+        let arrays = columns.into_iter().map(|(_, array)| array).collect();
+        RecordBatchT::try_new(height, Arc::new(schema), arrays).unwrap()
+    }
+
+    #[test]
+    fn test_batch_cells_route_native_and_empty_batches_to_arrow() {
+        let batch = create_record_batch(vec![
+            ("x", PrimitiveArray::<i64>::from_vec(vec![1, 2]).boxed()),
+            ("s", Utf8ViewArray::from_slice([Some("a"), None]).boxed()),
+        ]);
+        assert!(matches!(
+            XlsxBatchCells::from_record_batch(batch).unwrap(),
+            XlsxBatchCells::Arrow(_)
+        ));
+
+        // No cell is read from an empty batch, whatever its dtypes.
+        let batch = create_record_batch(vec![
+            ("x", new_empty_array(ArrowDataType::Int64)),
+            ("b", new_empty_array(ArrowDataType::BinaryView)),
+        ]);
+        assert!(matches!(
+            XlsxBatchCells::from_record_batch(batch).unwrap(),
+            XlsxBatchCells::Arrow(_)
+        ));
+    }
+
+    #[test]
+    fn test_batch_cells_route_logical_dtypes_to_dataframe() {
+        let batch = create_record_batch(vec![
+            ("x", PrimitiveArray::<i64>::from_vec(vec![1, 2]).boxed()),
+            (
+                "b",
+                BinaryViewArray::from_slice_values([b"ab".as_slice(), b"cd".as_slice()]).boxed(),
+            ),
+        ]);
+        match XlsxBatchCells::from_record_batch(batch).unwrap() {
+            XlsxBatchCells::DataFrame(df) => {
+                assert_eq!(df.height(), 2);
+                assert_eq!(df.get_column_names_str(), vec!["x", "b"]);
+                assert_eq!(df.get_columns()[1].dtype(), &DataType::Binary);
+            }
+            XlsxBatchCells::Arrow(_) => panic!("non-native dtype must be read as a DataFrame"),
+        }
+    }
+
+    #[test]
+    fn test_select_inferred_column_indices_matches_baseline_classification() {
+        let dtypes = [
+            ArrowDataType::Float16,
+            ArrowDataType::Decimal(10, 2),
+            ArrowDataType::Dictionary(
+                IntegerType::UInt32,
+                Box::new(ArrowDataType::Utf8View),
+                false,
+            ),
+            ArrowDataType::Boolean,
+            ArrowDataType::Int64,
+            ArrowDataType::Utf8View,
+            ArrowDataType::UInt8,
+            ArrowDataType::Float64,
+            ArrowDataType::Date32,
+        ];
+        // Baseline: numeric columns first, then integer columns among them.
+        let cols_idx_numeric_expected = dtypes
+            .iter()
+            .enumerate()
+            .filter(|(_, dtype)| is_arrow_numeric_dtype(dtype))
+            .map(|(idx, _)| idx)
+            .collect::<Vec<_>>();
+        let cols_idx_integer_expected = cols_idx_numeric_expected
+            .iter()
+            .copied()
+            .filter(|idx| is_arrow_integer_dtype(&dtypes[*idx]))
+            .collect::<Vec<_>>();
+        assert_eq!(cols_idx_numeric_expected, vec![0, 1, 4, 6, 7]);
+        assert_eq!(cols_idx_integer_expected, vec![4, 6]);
+
+        let options_write = XlsxWriteOptions::default();
+        assert_eq!(
+            select_inferred_column_indices(dtypes.iter().map(classify_arrow_dtype), &options_write),
+            (cols_idx_numeric_expected.clone(), cols_idx_integer_expected)
+        );
+
+        let options_write = XlsxWriteOptions {
+            should_infer_integer_cols: false,
+            ..XlsxWriteOptions::default()
+        };
+        assert_eq!(
+            select_inferred_column_indices(dtypes.iter().map(classify_arrow_dtype), &options_write),
+            (cols_idx_numeric_expected, vec![])
+        );
+
+        let options_write = XlsxWriteOptions {
+            should_infer_numeric_cols: false,
+            ..XlsxWriteOptions::default()
+        };
+        assert_eq!(
+            select_inferred_column_indices(dtypes.iter().map(classify_arrow_dtype), &options_write),
+            (vec![], vec![])
+        );
+    }
+}
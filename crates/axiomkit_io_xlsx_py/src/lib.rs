@@ -1,7 +1,7 @@
 use std::path::PathBuf;
 use std::sync::Arc;
 
-use arrow::array::StructArray;
+use arrow::array::{StructArray, new_empty_array};
 use arrow::datatypes::{ArrowDataType, ArrowSchema, Field as ArrowField};
 use arrow::record_batch::RecordBatchT;
 use axiomkit_io_xlsx::constant::{
@@ -13,6 +13,7 @@ use axiomkit_io_xlsx::spec::{
 };
 use axiomkit_io_xlsx::{
     XlsxRecordBatch, XlsxRecordBatchResult, XlsxSheetWriteOptions, XlsxWriter as RsXlsxWriter,
+    calculate_row_chunk_size_with_row_bytes, estimate_arrow_row_bytes,
 };
 use polars::prelude::{AnyValue, DataFrame};
 use pyo3::exceptions::{PyRuntimeError, PyValueError};
@@ -459,7 +460,17 @@ impl Iterator for PyRecordBatchIter<'_> {
                     }
                     Some(Err(err)) => return Some(Err(err.to_string())),
                     None => {
-                        self.stream_current = None;
+                        // A source stream that ends without batches still carries its
+                        // schema; yield one empty batch so the sheet header can be laid out.
+                        if let Some(stream_done) = self.stream_current.take()
+                            && !self.has_yielded_batch
+                            && self.iter.is_none()
+                            && self.schema_fallback.is_none()
+                        {
+                            self.has_yielded_batch = true;
+                            self.is_done = true;
+                            return Some(create_empty_record_batch(&stream_done.schema_ref));
+                        }
                     }
                 }
             }
@@ -612,6 +623,15 @@ fn create_arrow_c_stream_batch_iter_from_arrow_stream_source<'py>(
     PyArrowCStreamBatchIter::try_new(obj_capsule, Some(obj.clone()))
 }
 
+fn create_empty_record_batch(schema_ref: &Arc<ArrowSchema>) -> XlsxRecordBatchResult {
+    let l_arrays = schema_ref
+        .iter_values()
+        .map(|field| new_empty_array(field.dtype().clone()))
+        .collect();
+    RecordBatchT::try_new(0, schema_ref.clone(), l_arrays)
+        .map_err(|err| format!("Failed to construct empty Arrow record batch from stream: {err}"))
+}
+
 fn derive_arrow_schema_from_stream_field(field: &ArrowField) -> PyResult<ArrowSchema> {
     match field.dtype() {
         ArrowDataType::Struct(fields) => Ok(fields
@@ -778,6 +798,14 @@ fn parse_xlsx_write_options(obj: Option<&Bound<'_, PyAny>>) -> PyResult<Option<X
         if let Some(v) = extract_optional_attr::<usize>(&row_chunk_policy_obj, "fixed_size")? {
             cfg_options_write.row_chunk_policy.fixed_size = Some(v);
         }
+        if let Some(v) = extract_optional_attr::<i64>(&row_chunk_policy_obj, "target_bytes")? {
+            let target_bytes = usize::try_from(v).ok().filter(|val| *val >= 1).ok_or_else(|| {
+                PyValueError::new_err(format!(
+                    "{PY_ARG_OPTIONS_WRITE}.row_chunk_policy.target_bytes must be >= 1, got {v}."
+                ))
+            })?;
+            cfg_options_write.row_chunk_policy.target_bytes = Some(target_bytes);
+        }
     }
 
     if let Some(base_format_patch_obj) = extract_optional_attr_bound(obj, "base_format_patch")?
@@ -1001,11 +1029,35 @@ fn profile_arrow_drain_py<'py>(
     })
 }
 
+#[pyfunction(name = "_calculate_row_chunk_size", signature = (schema_body, options_write=None))]
+fn calculate_row_chunk_size_py<'py>(
+    py: Python<'py>,
+    schema_body: &Bound<'py, PyAny>,
+    options_write: Option<&Bound<'py, PyAny>>,
+) -> PyResult<usize> {
+    let cfg_options_write =
+        parse_xlsx_write_options(options_write)?.unwrap_or_else(create_default_xlsx_write_options);
+    let stream = create_arrow_c_stream_batch_iter_from_any_dataframe(py, schema_body)?;
+    let schema = &stream.schema_ref;
+    let chunk_size = calculate_row_chunk_size_with_row_bytes(
+        schema.len(),
+        Some(estimate_arrow_row_bytes(schema)),
+        &cfg_options_write.row_chunk_policy,
+    );
+    if chunk_size < 1 {
+        return Err(PyValueError::new_err(
+            "row_chunk_policy resolved to 0 rows; expected >= 1.",
+        ));
+    }
+    Ok(chunk_size)
+}
+
 pub fn register_xlsx_bindings(module: &Bound<'_, PyModule>) -> PyResult<()> {
     debug_assert!(!PY_VISIBLE_SYMBOLS.is_empty());
     module.add_class::<PyXlsxWriter>()?;
     module.add_class::<PyXlsxArrowDrainProfile>()?;
     module.add_function(wrap_pyfunction!(profile_arrow_drain_py, module)?)?;
+    module.add_function(wrap_pyfunction!(calculate_row_chunk_size_py, module)?)?;
     Ok(())
 }
 
@@ -5,6 +5,7 @@ from axiomkit import _axiomkit_rs as _core_rs
 XlsxWriter = _core_rs.XlsxWriter
 XlsxArrowDrainProfile = _core_rs.XlsxArrowDrainProfile
 _profile_arrow_drain = _core_rs._profile_arrow_drain
+_calculate_row_chunk_size = _core_rs._calculate_row_chunk_size
 
 __bridge_abi__ = _core_rs.__bridge_xlsx_abi__
 __bridge_contract__ = _core_rs.__bridge_xlsx_contract__
@@ -14,6 +15,7 @@ __all__ = [
     "XlsxWriter",
     "XlsxArrowDrainProfile",
     "_profile_arrow_drain",
+    "_calculate_row_chunk_size",
     "__bridge_abi__",
     "__bridge_contract__",
     "__bridge_transport__",
@@ -88,3 +88,4 @@ class XlsxWriter:
     ) -> XlsxWriter: ...
 
 def _profile_arrow_drain(source: Any) -> XlsxArrowDrainProfile: ...
+def _calculate_row_chunk_size(schema_body: Any, options_write: Any = ...) -> int: ...
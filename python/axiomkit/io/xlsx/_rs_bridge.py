@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, NoReturn
 
 EXPECTED_BRIDGE_ABI = 2
 EXPECTED_BRIDGE_CONTRACT = "axiomkit.xlsx.writer.v2"
@@ -58,7 +58,7 @@ def is_rs_backend_available() -> bool:
     return _XlsxWriterRs is not None
 
 
-def _raise_unavailable() -> None:
+def _raise_unavailable() -> NoReturn:
     if _error_contract is not None:
         raise RuntimeError("Rust xlsx backend contract validation failed.") from _error_contract
     if _error_import is not None:
@@ -66,6 +66,14 @@ def _raise_unavailable() -> None:
     raise RuntimeError("Rust xlsx backend is unavailable")
 
 
+def calculate_row_chunk_size_via_rs(
+    schema_body: Any, *, options_write: Any = None
+) -> int:
+    if _mod_rs is None or _XlsxWriterRs is None:  # pragma: no cover
+        _raise_unavailable()
+    return int(_mod_rs._calculate_row_chunk_size(schema_body, options_write))
+
+
 def create_xlsx_writer_via_rs(
     file_out: str,
     *,
@@ -135,6 +135,7 @@ class XlsxRowChunkPolicy:
     size_medium: int = 2_000
     size_default: int = 10_000
     fixed_size: int | None = None
+    target_bytes: int | None = None
 
 
 @dataclass(frozen=True, slots=True)
@@ -1,13 +1,17 @@
 import os
 import warnings
-from collections.abc import Mapping, Sequence
+from collections.abc import Iterator, Mapping, Sequence
 from pathlib import Path
 from types import TracebackType
 from typing import Any, ClassVar, Literal, Protocol, Self, cast
 
 import polars as pl
 
-from ._rs_bridge import create_xlsx_writer_via_rs, is_rs_backend_available
+from ._rs_bridge import (
+    calculate_row_chunk_size_via_rs,
+    create_xlsx_writer_via_rs,
+    is_rs_backend_available,
+)
 from .constant import (
     DEFAULT_XLSX_FORMATS,
     DEFAULT_XLSX_WRITE_OPTIONS,
@@ -23,6 +27,10 @@ from .spec import (
 )
 
 
+class ArrowStreamExportable(Protocol):
+    def __arrow_c_stream__(self, requested_schema: object | None = None) -> object: ...
+
+
 class ProtocolXlsxWriterBackend(Protocol):
     def close(self) -> None: ...
 
@@ -142,7 +150,7 @@ class XlsxWriter:
 
     def write_sheet(
         self,
-        body: pl.DataFrame | pl.LazyFrame,
+        body: pl.DataFrame | pl.LazyFrame | ArrowStreamExportable,
         sheet_name: str,
         *,
         header: pl.DataFrame | None = None,
@@ -159,8 +167,14 @@ class XlsxWriter:
 
         Args:
             body: Polars DataFrame or LazyFrame to write. DataFrame inputs are
-                converted to LazyFrame internally and use the same streaming
-                writer path as LazyFrame inputs.
+                streamed as zero-copy row slices; LazyFrame inputs are streamed
+                via ``collect_batches``. Both use the same writer path. Other
+                objects exposing ``__arrow_c_stream__`` (for example
+                ``pyarrow.Table`` or ``pyarrow.RecordBatchReader``) are read
+                batch by batch from the stream when ``policy_autofit`` only
+                measures the header. Body autofit (``mode="body" | "all"``)
+                reads the body twice, so such inputs are first loaded with
+                ``pl.DataFrame(body)``.
             sheet_name: Requested worksheet name before Excel sanitization and
                 uniqueness adjustments.
             header: Optional custom header grid as a Polars DataFrame. When
@@ -193,7 +207,6 @@ class XlsxWriter:
                 Only numeric values that fall within the policy scope and
                 trigger thresholds use the scientific format; other cells keep
                 the column base format.
-
         Returns:
             Self: The current writer instance for fluent chaining.
 
@@ -234,16 +247,50 @@ class XlsxWriter:
         """
         _warn_numeric_string_column_selectors(cols_integer, arg_name="cols_integer")
         _warn_numeric_string_column_selectors(cols_decimal, arg_name="cols_decimal")
-        body_lazy = _normalize_body(body)
         header_normalized = _normalize_header(header)
-        schema_body = _derive_schema_body(body_lazy)
+        is_single_pass = _can_write_lazy_single_pass(policy_autofit)
+        if is_single_pass and _is_arrow_stream_source(body):
+            # The backend imports the capsule batch by batch and takes the schema of
+            # an empty stream from the stream itself, so nothing is loaded up front.
+            self._writer.write_sheet_batches_single_pass(
+                batches_write=body,
+                sheet_name=sheet_name,
+                header=header_normalized,
+                cols_integer=cols_integer,
+                cols_decimal=cols_decimal,
+                num_frozen_cols=num_frozen_cols,
+                num_frozen_rows=num_frozen_rows,
+                should_merge_header=should_merge_header,
+                should_keep_missing_values=should_keep_missing_values,
+                policy_autofit=policy_autofit,
+                policy_scientific=policy_scientific,
+                schema_body=None,
+            )
+            return self
 
-        chunk_size = _derive_collect_batches_chunk_size(
-            body_lazy, options_write=self._options_write
+        body_normalized = _normalize_body(body)
+        # Resolving a LazyFrame schema walks the query plan; do it once per sheet.
+        schema = body_normalized.collect_schema()
+        schema_body = _derive_schema_body(schema)
+
+        # Row chunk sizing lives in the Rust kernel, so both sides share one formula.
+        chunk_size = calculate_row_chunk_size_via_rs(
+            schema_body, options_write=self._options_write
+        )
+        # An empty in-memory body has nothing to stream; the backend falls back to
+        # `schema_body` instead of executing the lazy query (twice, on two-pass).
+        is_body_empty = (
+            isinstance(body_normalized, pl.DataFrame) and body_normalized.is_empty()
         )
-        if _can_write_lazy_single_pass(policy_autofit):
+
+        def _iter_body_batches() -> Iterator[pl.DataFrame]:
+            if is_body_empty:
+                return iter(())
+            return _iter_batches(body_normalized, chunk_size=chunk_size)
+
+        if is_single_pass:
             self._writer.write_sheet_batches_single_pass(
-                batches_write=_collect_batches(body_lazy, chunk_size=chunk_size),
+                batches_write=_iter_body_batches(),
                 sheet_name=sheet_name,
                 header=header_normalized,
                 cols_integer=cols_integer,
@@ -258,8 +305,8 @@ class XlsxWriter:
             )
         else:
             self._writer.write_sheet_batches(
-                batches_scan=_collect_batches(body_lazy, chunk_size=chunk_size),
-                batches_write=_collect_batches(body_lazy, chunk_size=chunk_size),
+                batches_scan=_iter_body_batches(),
+                batches_write=_iter_body_batches(),
                 sheet_name=sheet_name,
                 header=header_normalized,
                 cols_integer=cols_integer,
@@ -275,12 +322,25 @@ class XlsxWriter:
         return self
 
 
-def _normalize_body(value: pl.DataFrame | pl.LazyFrame) -> pl.LazyFrame:
-    if isinstance(value, pl.LazyFrame):
+def _is_arrow_stream_source(
+    value: pl.DataFrame | pl.LazyFrame | ArrowStreamExportable,
+) -> bool:
+    if isinstance(value, pl.DataFrame | pl.LazyFrame):
+        return False
+    return hasattr(value, "__arrow_c_stream__")
+
+
+def _normalize_body(
+    value: pl.DataFrame | pl.LazyFrame | ArrowStreamExportable,
+) -> pl.DataFrame | pl.LazyFrame:
+    if isinstance(value, pl.DataFrame | pl.LazyFrame):
         return value
-    if isinstance(value, pl.DataFrame):
-        return value.lazy()
-    raise TypeError("body must be a polars DataFrame or LazyFrame.")
+    if _is_arrow_stream_source(value):
+        # Two-pass autofit reads the body twice, which a one-shot stream cannot do.
+        return pl.DataFrame(value)
+    raise TypeError(
+        "body must be a polars DataFrame or LazyFrame, or an Arrow C stream source."
+    )
 
 
 def _normalize_header(value: pl.DataFrame | None) -> pl.DataFrame | None:
@@ -289,8 +349,8 @@ def _normalize_header(value: pl.DataFrame | None) -> pl.DataFrame | None:
     raise TypeError("header must be a polars DataFrame or None.")
 
 
-def _derive_schema_body(value: pl.LazyFrame) -> pl.DataFrame:
-    return pl.DataFrame(schema=value.collect_schema())
+def _derive_schema_body(schema: pl.Schema) -> pl.DataFrame:
+    return pl.DataFrame(schema=schema)
 
 
 def _can_write_lazy_single_pass(policy_autofit: AutofitPolicy | None) -> bool:
@@ -299,6 +359,16 @@ def _can_write_lazy_single_pass(policy_autofit: AutofitPolicy | None) -> bool:
     return policy_autofit.mode in {"header", "none"}
 
 
+def _iter_batches(
+    value: pl.DataFrame | pl.LazyFrame, *, chunk_size: int
+) -> Iterator[pl.DataFrame]:
+    # In-memory frames are sliced zero-copy instead of round-tripping through a
+    # lazy query just to be cut back into batches.
+    if isinstance(value, pl.DataFrame):
+        return value.iter_slices(n_rows=chunk_size)
+    return _collect_batches(value, chunk_size=chunk_size)
+
+
 def _collect_batches(value: Any, *, chunk_size: int) -> Any:
     try:
         return value.collect_batches(chunk_size=chunk_size)
@@ -306,41 +376,6 @@ def _collect_batches(value: Any, *, chunk_size: int) -> Any:
         return value.collect_batches()
 
 
-def _derive_collect_batches_chunk_size(
-    value: Any, *, options_write: XlsxWriteOptions
-) -> int:
-    width = _derive_lazy_width(value)
-    policy = options_write.row_chunk_policy
-
-    if policy.fixed_size is not None:
-        chunk_size = policy.fixed_size
-    elif width >= policy.width_large:
-        chunk_size = policy.size_large
-    elif width >= policy.width_medium:
-        chunk_size = policy.size_medium
-    else:
-        chunk_size = policy.size_default
-
-    if chunk_size < 1:
-        raise ValueError("row_chunk_policy resolved to 0 rows; expected >= 1.")
-    return chunk_size
-
-
-def _derive_lazy_width(value: Any) -> int:
-    collect_schema = getattr(value, "collect_schema", None)
-    if callable(collect_schema):
-        return len(cast(Any, collect_schema()))
-
-    schema = getattr(value, "schema", None)
-    if schema is not None:
-        try:
-            return len(cast(Any, schema))
-        except TypeError:
-            return 0
-
-    return 0
-
-
 def _warn_numeric_string_column_selectors(
     value: Sequence[ColumnIdentifier] | None | Literal[False] | object,
     *,
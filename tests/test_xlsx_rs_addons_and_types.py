@@ -9,6 +9,7 @@ import pytest
 from axiomkit.io.xlsx import XlsxWriter  # noqa: E402
 from axiomkit.io.xlsx._rs_bridge import is_rs_backend_available  # noqa: E402
 from axiomkit.io.xlsx.spec import (  # noqa: E402
+    AutofitPolicy,
     SheetSlice,
     XlsxReport,
     XlsxWriteOptions,
@@ -94,6 +95,105 @@ def test_xlsx_writer_rejects_non_polars_body(tmp_path: Path) -> None:
             inst_xlsx_writer.write_sheet({"a": [1]}, "S")  # type: ignore[arg-type]
 
 
+class _ArrowStreamSource:
+    """Minimal non-pyarrow object exposing only the Arrow PyCapsule stream."""
+
+    def __init__(self, df: pl.DataFrame) -> None:
+        self._df = df
+
+    def __arrow_c_stream__(self, requested_schema: object | None = None) -> object:
+        return self._df.__arrow_c_stream__(requested_schema)
+
+
+def test_xlsx_writer_accepts_capsule_only_arrow_stream_body(tmp_path: Path) -> None:
+    if not is_rs_backend_available():
+        pytest.skip("Rust xlsx backend is unavailable")
+
+    body = _ArrowStreamSource(pl.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]}))
+    with XlsxWriter(tmp_path / "capsule_body.xlsx") as inst_xlsx_writer:
+        inst_xlsx_writer.write_sheet(body, "S")
+        reports = inst_xlsx_writer.report()
+
+    assert reports[0].sheets[0].row_end_exclusive == 3
+    assert reports[0].sheets[0].col_end_exclusive == 2
+
+
+class _OneShotArrowStreamSource(_ArrowStreamSource):
+    """Arrow stream that can be exported only once, like a ``RecordBatchReader``."""
+
+    def __init__(self, df: pl.DataFrame) -> None:
+        super().__init__(df)
+        self.num_exports = 0
+
+    def __arrow_c_stream__(self, requested_schema: object | None = None) -> object:
+        if self.num_exports:
+            raise RuntimeError("Arrow stream was already consumed.")
+        self.num_exports += 1
+        return super().__arrow_c_stream__(requested_schema)
+
+
+def test_xlsx_writer_streams_arrow_stream_body_batches(tmp_path: Path) -> None:
+    if not is_rs_backend_available():
+        pytest.skip("Rust xlsx backend is unavailable")
+
+    df = pl.concat(
+        [pl.DataFrame({"a": [1, 2]}), pl.DataFrame({"a": [3, 4, 5]})], rechunk=False
+    )
+    body = _OneShotArrowStreamSource(df)
+    body_empty = _OneShotArrowStreamSource(pl.DataFrame(schema={"a": pl.Int64}))
+    with XlsxWriter(tmp_path / "stream_body.xlsx") as inst_xlsx_writer:
+        inst_xlsx_writer.write_sheet(body, "S")
+        inst_xlsx_writer.write_sheet(body_empty, "E")
+        reports = inst_xlsx_writer.report()
+
+    assert body.num_exports == 1
+    assert reports[0].sheets[0].row_end_exclusive == 5
+    assert reports[1].sheets[0].row_end_exclusive == 0
+    assert reports[1].sheets[0].col_end_exclusive == 1
+
+
+def test_xlsx_writer_loads_arrow_stream_body_for_body_autofit(tmp_path: Path) -> None:
+    if not is_rs_backend_available():
+        pytest.skip("Rust xlsx backend is unavailable")
+
+    body = _OneShotArrowStreamSource(pl.DataFrame({"a": [1, 2, 3]}))
+    with XlsxWriter(tmp_path / "stream_body_autofit.xlsx") as inst_xlsx_writer:
+        inst_xlsx_writer.write_sheet(
+            body, "S", policy_autofit=AutofitPolicy(mode="all")
+        )
+        reports = inst_xlsx_writer.report()
+
+    assert body.num_exports == 1
+    assert reports[0].sheets[0].row_end_exclusive == 3
+
+
+def test_xlsx_writer_rejects_arrow_array_only_body(tmp_path: Path) -> None:
+    if not is_rs_backend_available():
+        pytest.skip("Rust xlsx backend is unavailable")
+
+    class _ArrowArraySource:
+        def __arrow_c_array__(self, requested_schema: object | None = None) -> object:
+            raise AssertionError("array export must not be used for bodies")
+
+    with XlsxWriter(tmp_path / "array_body.xlsx") as inst_xlsx_writer:
+        with pytest.raises(TypeError, match="or an Arrow C stream source"):
+            inst_xlsx_writer.write_sheet(_ArrowArraySource(), "S")  # type: ignore[arg-type]
+
+
+def test_xlsx_writer_accepts_arrow_stream_body(tmp_path: Path) -> None:
+    if not is_rs_backend_available():
+        pytest.skip("Rust xlsx backend is unavailable")
+    pa = pytest.importorskip("pyarrow")
+
+    body = pa.table({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    with XlsxWriter(tmp_path / "arrow_body.xlsx") as inst_xlsx_writer:
+        inst_xlsx_writer.write_sheet(body, "S")
+        reports = inst_xlsx_writer.report()
+
+    assert reports[0].sheets[0].row_end_exclusive == 3
+    assert reports[0].sheets[0].col_end_exclusive == 2
+
+
 def test_xlsx_writer_rejects_non_dataframe_header(tmp_path: Path) -> None:
     if not is_rs_backend_available():
         pytest.skip("Rust xlsx backend is unavailable")
@@ -11,9 +11,11 @@ from axiomkit.io.xlsx import XlsxWriter
 from axiomkit.io.xlsx._rs_bridge import (  # noqa: E402
     EXPECTED_BRIDGE_ABI,
     EXPECTED_BRIDGE_CONTRACT,
+    calculate_row_chunk_size_via_rs,
     create_xlsx_writer_via_rs,
     is_rs_backend_available,
 )
+from axiomkit.io.xlsx.spec import XlsxRowChunkPolicy, XlsxWriteOptions
 
 
 def _create_rs_writer(file_out: Path) -> Any:
@@ -171,6 +173,27 @@ def test_xlsx_rs_bridge_profile_arrow_drain_counts_direct_stream() -> None:
     assert profile.cells == 6
 
 
+def test_xlsx_rs_bridge_row_chunk_size_uses_rust_policy() -> None:
+    if not is_rs_backend_available():
+        pytest.skip("Rust xlsx backend is unavailable")
+
+    schema_body = pl.DataFrame(
+        schema={"a": pl.Int64, "b": pl.Int32, "c": pl.String, "d": pl.Boolean}
+    )
+    row_bytes = 8 + 4 + 32 + 1
+
+    def _calculate(**kwargs: int) -> int:
+        options_write = XlsxWriteOptions(row_chunk_policy=XlsxRowChunkPolicy(**kwargs))
+        return calculate_row_chunk_size_via_rs(schema_body, options_write=options_write)
+
+    assert calculate_row_chunk_size_via_rs(schema_body) == 10_000
+    assert _calculate(target_bytes=row_bytes * 1_000) == 1_000
+    # Tiny byte targets are floored at the Rust minimum chunk size.
+    assert _calculate(target_bytes=1) == 256
+    with pytest.raises(ValueError, match="target_bytes must be >= 1"):
+        _calculate(target_bytes=0)
+
+
 def test_xlsx_writer_accepts_lazyframe_input(tmp_path: Path) -> None:
     if not is_rs_backend_available():
         pytest.skip("Rust xlsx backend is unavailable")
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import datetime as dt
 import warnings
 import xml.etree.ElementTree as ET
 import zipfile
@@ -321,3 +322,79 @@ def test_row_chunk_policy_is_active_in_write_path(tmp_path: Path) -> None:
 
     _, c_value, _ = read_cell(path_file_ok, "A4")
     assert float(c_value) == 3.0
+
+
+def test_row_chunk_policy_target_bytes_spans_chunks(tmp_path: Path) -> None:
+    if not is_rs_backend_available():
+        pytest.skip("Rust xlsx backend is unavailable")
+
+    df = pl.DataFrame({"x": list(range(600)), "s": [f"v{i}" for i in range(600)]})
+    opts = XlsxWriteOptions(row_chunk_policy=XlsxRowChunkPolicy(target_bytes=1))
+
+    for mode in ("none", "all"):
+        path_file = tmp_path / f"target_bytes_{mode}.xlsx"
+        with XlsxWriter(path_file, options_write=opts) as writer:
+            writer.write_sheet(
+                body=df,
+                sheet_name="S",
+                policy_autofit=AutofitPolicy(mode=mode),
+            )
+
+        _, c_value, _ = read_cell(path_file, "A601")
+        assert float(c_value) == 599.0
+
+
+@pytest.mark.parametrize("target_bytes", [0, -1])
+def test_row_chunk_policy_rejects_non_positive_target_bytes(
+    tmp_path: Path, target_bytes: int
+) -> None:
+    if not is_rs_backend_available():
+        pytest.skip("Rust xlsx backend is unavailable")
+
+    opts = XlsxWriteOptions(
+        row_chunk_policy=XlsxRowChunkPolicy(target_bytes=target_bytes)
+    )
+    with pytest.raises(ValueError, match="target_bytes must be >= 1"):
+        XlsxWriter(tmp_path / "bad_target_bytes.xlsx", options_write=opts)
+
+
+def test_empty_dataframe_body_writes_header_only_sheet(tmp_path: Path) -> None:
+    if not is_rs_backend_available():
+        pytest.skip("Rust xlsx backend is unavailable")
+
+    df = pl.DataFrame(schema={"x": pl.Int64, "d": pl.Date})
+
+    for mode in ("none", "all"):
+        path_file = tmp_path / f"empty_{mode}.xlsx"
+        with XlsxWriter(path_file) as writer:
+            writer.write_sheet(
+                body=df,
+                sheet_name="S",
+                policy_autofit=AutofitPolicy(mode=mode),
+            )
+            reports = writer.report()
+
+        assert reports[0].sheets[0].row_end_exclusive == 0
+        assert reports[0].sheets[0].col_end_exclusive == 2
+        _, c_value, _ = read_cell(path_file, "B1")
+        assert c_value == "d"
+
+
+def test_lazyframe_date_column_renders_as_text_on_both_paths(tmp_path: Path) -> None:
+    if not is_rs_backend_available():
+        pytest.skip("Rust xlsx backend is unavailable")
+
+    lf = pl.LazyFrame({"x": [1, 2], "d": [dt.date(2024, 1, 2), dt.date(2024, 12, 31)]})
+
+    # `header` streams through the single-pass writer, `all` through two-pass.
+    for mode in ("header", "all"):
+        path_file = tmp_path / f"date_{mode}.xlsx"
+        with XlsxWriter(path_file) as writer:
+            writer.write_sheet(
+                body=lf,
+                sheet_name="S",
+                policy_autofit=AutofitPolicy(mode=mode),
+            )
+
+        assert read_cell(path_file, "B2")[1] == "2024-01-02"
+        assert read_cell(path_file, "B3")[1] == "2024-12-31"